@@ -5,16 +5,34 @@ Core evaluation logic for recipe generation quality assessment.
 import time
 import json
 import os
-from typing import Dict, List, Any, Optional
+import re
+from typing import Callable, Dict, List, Any, Optional
 from openai import OpenAI
 from dataclasses import dataclass
+from pydantic import ValidationError
 from src.recipes.models import Recipe
+from src.common.exceptions import RecipeValidationError
 from src.core.cooking_assistant import CookingAssistant
-from src.common.config import get_logger
+from src.common.config import get_recipe_config, get_logger
+from src.common.utils import get_http_client
 import json
 
 logger = get_logger(__name__)
 
+# Outermost {...} span in a model response, located in a single regex pass
+_JSON_BLOCK_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Reused decoder for judge responses
+_JSON_DECODE = json.JSONDecoder().decode
+
+# Query builders keyed by template type (similar to deprecated function)
+_QUERY_BUILDERS: Dict[str, Callable[[str, Dict[str, Any]], str]] = {
+    "quick": lambda ingredients, kwargs: f"Quick {kwargs.get('max_time', 30)}-minute recipe using {ingredients}",
+    "dietary": lambda ingredients, kwargs: f"{kwargs.get('dietary_type', 'vegetarian').title()} recipe using {ingredients}",
+    "cuisine": lambda ingredients, kwargs: f"{kwargs.get('cuisine', 'Italian')} recipe using {ingredients}",
+    "basic": lambda ingredients, kwargs: f"Recipe using {ingredients}",
+}
+
 
 @dataclass
 class EvaluationScore:
@@ -47,7 +65,7 @@ class RecipeEvaluator:
     
     def __init__(self, judge_model: str = "gpt-3.5-turbo"):
         api_key = os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=get_http_client())
         self.judge_model = judge_model
         self.evaluation_prompt = self._create_evaluation_prompt()
     
@@ -103,18 +121,9 @@ Respond in this exact JSON format:
             # Generate recipe using CookingAssistant
             assistant = CookingAssistant()
             
-            # Construct query based on template type (similar to deprecated function)
-            if template_type == "quick":
-                max_time = kwargs.get("max_time", 30)
-                query = f"Quick {max_time}-minute recipe using {ingredients}"
-            elif template_type == "dietary":
-                dietary_type = kwargs.get("dietary_type", "vegetarian")
-                query = f"{dietary_type.title()} recipe using {ingredients}"
-            elif template_type == "cuisine":
-                cuisine = kwargs.get("cuisine", "Italian")
-                query = f"{cuisine} recipe using {ingredients}"
-            else:  # basic
-                query = f"Recipe using {ingredients}"
+            # Construct query based on template type, unknown types fall back to basic
+            build_query = _QUERY_BUILDERS.get(template_type, _QUERY_BUILDERS["basic"])
+            query = build_query(ingredients, kwargs)
             
             # Get response from assistant
             result = assistant.ask(query)
@@ -126,45 +135,15 @@ Respond in this exact JSON format:
             
             # Extract Recipe object from response
             response_text = result['response']
-            try:
-                # Look for JSON structure in response
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx > start_idx:
-                    json_text = response_text[start_idx:end_idx]
-                    recipe_data = json.loads(json_text)
-                    recipe = Recipe(**recipe_data)
-                else:
-                    # Fallback: create basic recipe structure
-                    ingredient_list = [ing.strip() for ing in ingredients.split(',') if ing.strip()]
-                    recipe = Recipe(
-                        title=f"Recipe using {ingredients}",
-                        prep_time=15,
-                        cook_time=30,
-                        servings=4,
-                        difficulty="Beginner",
-                        ingredients=ingredient_list[:3] if len(ingredient_list) >= 2 else [ingredients, "salt"],
-                        instructions=[
-                            "Follow the generated instructions",
-                            response_text[:200] + "..." if len(response_text) > 200 else response_text
-                        ]
-                    )
-            except (json.JSONDecodeError, ValueError):
-                # Fallback: create basic recipe structure  
-                ingredient_list = [ing.strip() for ing in ingredients.split(',') if ing.strip()]
-                recipe = Recipe(
-                    title=f"Recipe using {ingredients}",
-                    prep_time=15,
-                    cook_time=30,
-                    servings=4,
-                    difficulty="Beginner",
-                    ingredients=ingredient_list[:3] if len(ingredient_list) >= 2 else [ingredients, "salt"],
-                    instructions=[
-                        "Follow the generated instructions",
-                        response_text[:200] + "..." if len(response_text) > 200 else response_text
-                    ]
-                )
+            json_match = _JSON_BLOCK_RE.search(response_text)
+            if json_match:
+                try:
+                    # Parse and validate in a single pass instead of json.loads + Recipe(**data)
+                    recipe = Recipe.model_validate_json(json_match.group(0))
+                except (ValidationError, RecipeValidationError):
+                    recipe = self._fallback_recipe(ingredients, response_text)
+            else:
+                recipe = self._fallback_recipe(ingredients, response_text)
             
             performance_metrics["success"] = True
             
@@ -189,6 +168,25 @@ Respond in this exact JSON format:
             error=error
         )
     
+    def _fallback_recipe(self, ingredients: str, response_text: str) -> Recipe:
+        """Create a basic recipe structure when the response has no usable recipe JSON."""
+        ingredient_list = list(filter(None, map(str.strip, ingredients.split(','))))
+        preview_length = get_recipe_config().RESPONSE_PREVIEW_LENGTH
+        preview = response_text[:preview_length] + "..." if len(response_text) > preview_length else response_text
+        # Every value is a constant or derived from our own input, so skip validation
+        return Recipe.model_construct(
+            title=f"Recipe using {ingredients}",
+            prep_time=15,
+            cook_time=30,
+            servings=4,
+            difficulty="Beginner",
+            ingredients=ingredient_list[:3] if len(ingredient_list) >= 2 else [ingredients, "salt"],
+            instructions=[
+                "Follow the generated instructions",
+                preview
+            ]
+        )
+    
     def _judge_recipe(self, ingredients: str, template_type: str, recipe: Recipe) -> List[EvaluationScore]:
         """Use LLM to judge recipe quality."""
         prompt = self.evaluation_prompt.format(
@@ -207,7 +205,7 @@ Respond in this exact JSON format:
             result_text = response.choices[0].message.content
             
             # Parse the JSON response
-            result = json.loads(result_text)
+            result = _JSON_DECODE(result_text)
             
             # Convert to EvaluationScore objects
             scores = []
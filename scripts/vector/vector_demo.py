@@ -224,7 +224,7 @@ def demo_user_collections(has_api_key):
             return
         
         # Get user recipes
-        user_recipes = user_collection.get_user_recipes()
+        user_recipes = user_collection.get_user_recipes(include_documents=False)
         print(f"User has {len(user_recipes)} recipes")
         
         # Search user recipes
@@ -69,6 +69,9 @@ class RecipeConfig:
     # Response processing
     RESPONSE_PREVIEW_LENGTH: int = 200
     RESPONSE_FULL_LENGTH: int = 500
+    
+    # Safety validation results kept per process, keyed by recipe content
+    SAFETY_CACHE_SIZE: int = 1024
 
 
 @dataclass
@@ -107,6 +110,10 @@ class OpenAIConfig:
     # API retry settings
     MAX_RETRIES: int = 3
     RETRY_DELAY: float = 1.0
+    
+    # Shared HTTP connection pool
+    HTTP_MAX_CONNECTIONS: int = 64
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 32
 
 
 @dataclass
@@ -163,6 +170,23 @@ class VectorConfig:
     
     # Embedding settings
     EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_BATCH_SIZE: int = 100  # Texts sent per embeddings API request
+    MAX_CONCURRENT_BATCHES: int = 5  # Embedding batch requests in flight at once
+    EMBEDDING_CACHE_PATH: str = "data/embedding_cache.db"  # On-disk embedding cache used by ingestion
+    QUERY_EMBEDDING_CACHE_SIZE: int = 128  # Search query embeddings kept in memory per store
+    
+    # Semantic query cache settings
+    SEMANTIC_CACHE_ENABLED: bool = False  # Serve paraphrased queries from cached results
+    SEMANTIC_CACHE_COLLECTION_NAME: str = "query_cache"
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Minimum cosine similarity for a cache hit
+    
+    # Ingestion settings
+    INGESTION_CHUNK_SIZE: int = 64  # Recipes loaded and embedded per ingestion chunk
+    INGESTION_MAX_WORKERS: int = 16  # Concurrent single-recipe ingestions when batch ingestion fails
+    BATCH_API_MIN_RECIPES: int = 50  # Use the OpenAI Batch API when re-ingesting more recipes than this
+    BATCH_API_POLL_INTERVAL: float = 30.0  # Seconds between Batch API status checks
+    BATCH_API_COMPLETION_WINDOW: str = "24h"
+    INGESTION_PROGRESS_INTERVAL: int = 100  # Recipes between progress summaries during individual ingestion
     
     # Filtering settings
     ENABLE_FILTERING: bool = True  # Whether filtering is enabled
@@ -188,6 +212,7 @@ class VectorConfig:
     USER_COLLECTION_PREFIX: str = "user_recipes_"  # Prefix for user collections
     MAX_USER_RECIPES: int = 1000  # Maximum recipes per user
     USER_ID_MAX_LENGTH: int = 100  # Maximum length for user IDs
+    USER_RECIPE_PAGE_SIZE: int = 500  # Recipes fetched per request when iterating a user's collection
 
 
 @dataclass
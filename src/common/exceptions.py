@@ -1,5 +1,7 @@
 """Custom exceptions for the cooking assistant application."""
 
+from typing import List
+
 class CookingAssistantError(Exception):
     """Base exception for all cooking assistant errors."""
     pass
@@ -32,6 +34,13 @@ class VectorDatabaseError(CookingAssistantError):
     """Raised when vector database operations fail."""
     pass
 
+class PartialWriteError(VectorDatabaseError):
+    """Raised when a multi-chunk write fails after some recipes were already added."""
+    
+    def __init__(self, message: str, added_ids: List[str]):
+        super().__init__(message)
+        self.added_ids = added_ids
+
 class VectorSearchError(VectorDatabaseError):
     """Raised when vector search operations fail."""
     pass
@@ -4,10 +4,37 @@ Shared utilities that don't belong to specific modules.
 """
 
 import os
-from .config import get_logger
+from typing import Optional
+import httpx
+from openai import DefaultHttpxClient
+from .config import get_openai_config, get_logger
 
 logger = get_logger(__name__)
 
+# One connection pool shared by every OpenAI client in the process
+_http_client: Optional[httpx.Client] = None
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared HTTP client for OpenAI API calls.
+    
+    Passing this to each OpenAI client lets embedding and chat requests
+    reuse the same keep-alive connections and TLS sessions.
+    
+    Returns:
+        Pooled httpx client with the OpenAI SDK defaults
+    """
+    global _http_client
+    if _http_client is None:
+        config = get_openai_config()
+        _http_client = DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    return _http_client
+
 def check_openai_api_key() -> bool:
     """
     Check if OpenAI API key is available.
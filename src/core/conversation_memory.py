@@ -11,6 +11,38 @@ import re
 
 logger = get_logger(__name__)
 
+# Preference terms matched as substrings of the lowercased query, in the
+# order updates are reported. Each term is also the stored value.
+_DIETARY_TERMS = (
+    'vegetarian', 'vegan', 'gluten-free', 'dairy-free', 'low-carb',
+    'keto', 'paleo', 'diabetic', 'low-sodium'
+)
+_CUISINE_TERMS = ('italian', 'mexican', 'asian', 'chinese', 'indian', 'french', 'greek', 'thai')
+_QUICK_TIME_TERMS = ('quick', 'fast', '30 min', 'minutes')
+_BUDGET_TERMS = ('budget', 'cheap', 'affordable', 'save money')
+_EQUIPMENT_TERMS = ('slow cooker', 'instant pot', 'air fryer', 'grill', 'oven', 'stovetop')
+
+# Phrases that mark a query as a follow-up, matched as substrings
+_FOLLOWUP_INDICATORS = (
+    'what about', 'how about', 'can you also', 'what if', 'instead',
+    'alternatively', 'but what', 'however', 'also', 'too'
+)
+
+# Topic terms matched as substrings of the lowercased query, paired with
+# their prebuilt "category:term" topic tags in the order they are reported
+_TOPIC_TERMS = tuple(
+    (term, f"{category}:{term}")
+    for category, terms in (
+        ('cooking_method', ('bake', 'fry', 'grill', 'steam', 'boil', 'roast', 'sauté', 'stir-fry')),
+        ('meal_type', ('breakfast', 'lunch', 'dinner', 'snack', 'dessert', 'appetizer')),
+        # Ingredients (simple detection)
+        ('ingredient', ('chicken', 'beef', 'fish', 'vegetables', 'pasta', 'rice', 'eggs')),
+    )
+    for term in terms
+)
+
+_FAMILY_SIZE_RE = re.compile(r'family of (\d+)|(\d+) people|serves (\d+)')
+
 @dataclass
 class UserPreferences:
     """Stores user cooking preferences and constraints."""
@@ -28,26 +60,13 @@ class UserPreferences:
         query_lower = query.lower()
         
         # Dietary restrictions
-        dietary_terms = {
-            'vegetarian': 'vegetarian',
-            'vegan': 'vegan', 
-            'gluten-free': 'gluten-free',
-            'dairy-free': 'dairy-free',
-            'low-carb': 'low-carb',
-            'keto': 'keto',
-            'paleo': 'paleo',
-            'diabetic': 'diabetic',
-            'low-sodium': 'low-sodium'
-        }
-        
-        for term, restriction in dietary_terms.items():
-            if term in query_lower and restriction not in self.dietary_restrictions:
+        for restriction in _DIETARY_TERMS:
+            if restriction in query_lower and restriction not in self.dietary_restrictions:
                 self.dietary_restrictions.append(restriction)
                 updates.append(f"Added dietary restriction: {restriction}")
         
         # Cuisine preferences
-        cuisine_terms = ['italian', 'mexican', 'asian', 'chinese', 'indian', 'french', 'greek', 'thai']
-        for cuisine in cuisine_terms:
+        for cuisine in _CUISINE_TERMS:
             if cuisine in query_lower and cuisine not in self.cuisine_preferences:
                 self.cuisine_preferences.append(cuisine)
                 updates.append(f"Added cuisine preference: {cuisine}")
@@ -67,13 +86,17 @@ class UserPreferences:
                 updates.append("Set skill level: intermediate")
         
         # Cooking time preferences
-        if any(term in query_lower for term in ['quick', 'fast', '30 min', 'minutes']):
+        if any(term in query_lower for term in _QUICK_TIME_TERMS):
             if self.cooking_time_preference != 'quick':
                 self.cooking_time_preference = 'quick'
                 updates.append("Set time preference: quick meals")
         
-        # Family size
-        family_match = re.search(r'family of (\d+)|(\d+) people|serves (\d+)', query_lower)
+        # Family size. Every match contains one of these words, and checking
+        # for them is much cheaper than running the regex over the query
+        family_match = (
+            ('family of' in query_lower or 'people' in query_lower or 'serves' in query_lower)
+            and _FAMILY_SIZE_RE.search(query_lower)
+        )
         if family_match:
             size = int(family_match.group(1) or family_match.group(2) or family_match.group(3))
             if self.family_size != size:
@@ -81,29 +104,20 @@ class UserPreferences:
                 updates.append(f"Set family size: {size} people")
         
         # Budget consciousness
-        if any(term in query_lower for term in ['budget', 'cheap', 'affordable', 'save money']):
+        if any(term in query_lower for term in _BUDGET_TERMS):
             if not self.budget_conscious:
                 self.budget_conscious = True
                 updates.append("Noted budget consciousness")
         
         # Equipment
-        equipment_terms = {
-            'slow cooker': 'slow cooker',
-            'instant pot': 'instant pot', 
-            'air fryer': 'air fryer',
-            'grill': 'grill',
-            'oven': 'oven',
-            'stovetop': 'stovetop'
-        }
-        
-        for term, equipment in equipment_terms.items():
-            if term in query_lower and equipment not in self.equipment_available:
+        for equipment in _EQUIPMENT_TERMS:
+            if equipment in query_lower and equipment not in self.equipment_available:
                 self.equipment_available.append(equipment)
                 updates.append(f"Added available equipment: {equipment}")
         
         return updates
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTurn:
     """Represents a single turn in the conversation."""
     timestamp: datetime
@@ -168,28 +182,8 @@ class ConversationMemory:
     
     def _extract_topics(self, query: str) -> List[str]:
         """Extract cooking topics from user query."""
-        topics = []
         query_lower = query.lower()
-        
-        # Cooking methods
-        methods = ['bake', 'fry', 'grill', 'steam', 'boil', 'roast', 'sauté', 'stir-fry']
-        for method in methods:
-            if method in query_lower:
-                topics.append(f"cooking_method:{method}")
-        
-        # Meal types
-        meals = ['breakfast', 'lunch', 'dinner', 'snack', 'dessert', 'appetizer']
-        for meal in meals:
-            if meal in query_lower:
-                topics.append(f"meal_type:{meal}")
-        
-        # Ingredients (simple detection)
-        ingredients = ['chicken', 'beef', 'fish', 'vegetables', 'pasta', 'rice', 'eggs']
-        for ingredient in ingredients:
-            if ingredient in query_lower:
-                topics.append(f"ingredient:{ingredient}")
-        
-        return topics
+        return [topic for term, topic in _TOPIC_TERMS if term in query_lower]
     
     def _update_context(self, query: str, topics: List[str]) -> None:
         """Update current conversation context."""
@@ -228,22 +222,13 @@ class ConversationMemory:
     
     def _is_followup_question(self, query: str) -> bool:
         """Determine if current query is a follow-up to previous conversation."""
-        followup_indicators = [
-            'what about', 'how about', 'can you also', 'what if', 'instead',
-            'alternatively', 'but what', 'however', 'also', 'too'
-        ]
-        
         query_lower = query.lower()
         # Check for exact phrase matches and word boundary matches
-        for indicator in followup_indicators:
-            if indicator in query_lower:
-                return True
+        if any(indicator in query_lower for indicator in _FOLLOWUP_INDICATORS):
+            return True
         
         # Additional checks for common follow-up patterns
-        if query_lower.startswith(('and ', 'or ', 'but ')):
-            return True
-            
-        return False
+        return query_lower.startswith(('and ', 'or ', 'but '))
     
     def get_session_summary(self) -> Dict[str, Any]:
         """Get summary of current session."""
@@ -5,10 +5,18 @@ Simple recipe extraction from conversational text.
 from typing import Optional
 import json
 import os
+import re
 from dataclasses import dataclass
 from openai import OpenAI
 
 from src.recipes.models import Recipe
+from src.common.utils import get_http_client
+
+# Outermost {...} span in the model output, located in a single regex pass
+_JSON_BLOCK_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Reused decoder for model responses
+_JSON_DECODE = json.JSONDecoder().decode
 
 
 @dataclass 
@@ -26,21 +34,14 @@ class RecipeExtractor:
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OpenAI API key required")
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=get_http_client())
     
     def extract_recipe(self, text: str, recipe_name: Optional[str] = None) -> RecipeExtractionResult:
         """Extract recipe from text."""
         try:
             prompt = self._build_prompt(text, recipe_name)
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=800
-            )
-            
-            result_text = response.choices[0].message.content.strip()
+            result_text = self._stream_json_completion(prompt).strip()
             recipe_data = self._parse_json(result_text)
             
             recipe = Recipe(
@@ -58,6 +59,60 @@ class RecipeExtractor:
         except Exception as e:
             return RecipeExtractionResult(success=False, error=str(e))
     
+    def _stream_json_completion(self, prompt: str) -> str:
+        """
+        Stream the completion and stop as soon as the first JSON object closes.
+        
+        Anything the model writes after the object is discarded anyway, so
+        closing the stream early saves the tail of the generation.
+        
+        Returns:
+            The JSON object text, or the full completion if no object closed
+        """
+        stream = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.1,
+            max_tokens=800,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        text = ""
+        start = -1
+        depth = 0
+        in_string = False
+        escaped = False
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                offset = len(text)
+                text += delta
+                for i, char in enumerate(delta, offset):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == '\\':
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == '"' and start != -1:
+                        in_string = True
+                    elif char == '{':
+                        if start == -1:
+                            start = i
+                        depth += 1
+                    elif char == '}' and start != -1:
+                        depth -= 1
+                        if depth == 0:
+                            return text[start:i + 1]
+        finally:
+            stream.close()
+        
+        return text
+    
     def _build_prompt(self, text: str, recipe_name: Optional[str] = None) -> str:
         """Build extraction prompt."""
         name_part = f' Use "{recipe_name}" as title.' if recipe_name else ''
@@ -94,12 +149,11 @@ JSON:"""
                 text = text[start:end].strip()
             
             # Find JSON object
-            if '{' in text and '}' in text:
-                start = text.find('{')
-                end = text.rfind('}') + 1
-                text = text[start:end]
+            json_match = _JSON_BLOCK_RE.search(text)
+            if json_match:
+                text = json_match.group(0)
             
-            return json.loads(text)
+            return _JSON_DECODE(text)
             
         except:
             # Fallback
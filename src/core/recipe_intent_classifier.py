@@ -10,6 +10,7 @@ from openai import OpenAI
 
 from src.common.config import get_openai_config, get_logger
 from src.common.exceptions import CookingAssistantError
+from src.common.utils import get_http_client
 
 logger = get_logger(__name__)
 
@@ -40,7 +41,7 @@ class RecipeIntentClassifier:
         if not api_key:
             raise RecipeIntentClassificationError("OpenAI API key not found")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=get_http_client())
         self.config = get_openai_config()
     
     def classify_intent(self, query: str, conversation_context: Optional[Dict] = None) -> Tuple[RecipeIntent, float, str]:
@@ -1,19 +1,28 @@
-import json
+from functools import lru_cache
 from typing import List
+from pydantic import TypeAdapter
 from src.recipes.models import Recipe
 
+# Use hardcoded path since it's standardized
+EXAMPLE_RECIPES_PATH = 'data/example_recipes.json'
+
+# Schema-specialized validator: parses and validates the JSON bytes in one pass
+_RECIPE_LIST_ADAPTER = TypeAdapter(List[Recipe])
+
 def load_example_recipes() -> List[Recipe]:
     """Load example recipes from the configured path."""
-    # Use hardcoded path since it's standardized
-    example_recipes_path = 'data/example_recipes.json'
-    with open(example_recipes_path, 'r') as f:
-        data = json.load(f)
-    return [Recipe(**recipe) for recipe in data]
+    with open(EXAMPLE_RECIPES_PATH, 'rb') as f:
+        return _RECIPE_LIST_ADAPTER.validate_json(f.read())
 
+@lru_cache(maxsize=32)
 def get_few_shot_examples(num_examples: int = 3) -> str:
     """
     Generate formatted few-shot examples for prompt templates.
     
+    The example file does not change while the assistant runs, so the
+    formatted text is cached per count instead of being rebuilt for
+    every prompt.
+    
     Args:
         num_examples: Number of example recipes to include (default 3)
         
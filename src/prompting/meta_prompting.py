@@ -3,15 +3,19 @@ Meta-prompting system for cooking assistant.
 Automatically selects optimal prompting strategies based on query complexity.
 """
 
-from typing import Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 import os
 from openai import OpenAI
 from src.core.query_classifier import QueryClassifier, QueryComplexity
 from .prompts import select_prompt_template
 from src.common.exceptions import RecipeGenerationError
-from src.common.config import get_openai_config, get_prompt_config, get_logger
+from src.common.config import get_openai_config, get_prompt_config, get_vector_config, get_logger
+from src.common.utils import get_http_client
 import json
 
+if TYPE_CHECKING:
+    from .semantic_cache import SemanticQueryCache
+
 logger = get_logger(__name__)
 
 class PromptingStrategy:
@@ -100,7 +104,7 @@ class MetaPromptingSystem:
     def __init__(self):
         self.classifier = QueryClassifier()
         api_key = os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=get_http_client())
         
     def process_query(self, query: str, conversation_context: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -219,11 +223,32 @@ class MetaPromptingSystem:
                 
         return found_constraints
 
+# Singleton so the OpenAI client and its connection pool are reused across queries
+_system: Optional[MetaPromptingSystem] = None
+
+# Semantic cache shared across queries, created on first use when enabled
+_semantic_cache: Optional["SemanticQueryCache"] = None
+
+
+def _get_semantic_cache() -> "SemanticQueryCache":
+    """Get the shared semantic query cache, creating it on first use."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        # Lazy import so Chroma DB is only loaded when the cache is enabled
+        from .semantic_cache import SemanticQueryCache
+        _semantic_cache = SemanticQueryCache()
+    return _semantic_cache
+
+
 # Convenience function for easy integration
 def process_cooking_query(query: str, context: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Process a cooking query using meta-prompting system.
     
+    When the semantic cache is enabled, a close paraphrase of an earlier
+    query reuses its result instead of calling the model. Follow-up
+    questions always go to the model since they depend on recent turns.
+    
     Args:
         query: User's cooking question
         context: Optional conversation context
@@ -231,8 +256,23 @@ def process_cooking_query(query: str, context: Optional[Dict] = None) -> Dict[st
     Returns:
         Response with strategy and metadata
     """
-    system = MetaPromptingSystem()
-    return system.process_query(query, context)
+    global _system
+    if _system is None:
+        _system = MetaPromptingSystem()
+    
+    use_cache = get_vector_config().SEMANTIC_CACHE_ENABLED and not (context and context.get('recent_conversation'))
+    if not use_cache:
+        return _system.process_query(query, context)
+    
+    cache = _get_semantic_cache()
+    cached, embedding = cache.get(query)
+    if cached is not None:
+        return cached
+    
+    result = _system.process_query(query, context)
+    if result.get('success'):
+        cache.put(query, result, embedding)
+    return result
 
 # Example usage and testing
 if __name__ == "__main__":
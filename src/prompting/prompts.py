@@ -20,7 +20,7 @@ def create_basic_recipe_prompt(ingredients: str, skill_level: str = "intermediat
     Returns:
         Formatted prompt string with examples and structured reasoning process
     """
-    ingredient_list = [ing.strip() for ing in ingredients.split(',') if ing.strip()]
+    ingredient_list = list(filter(None, map(str.strip, ingredients.split(','))))
     few_shot_examples = get_few_shot_examples(3)
     
     return f"""You are Chef Marcus, a seasoned culinary professional with 20+ years of experience across diverse cooking traditions. Your background spans:
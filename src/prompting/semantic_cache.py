@@ -0,0 +1,111 @@
+"""
+Semantic cache for cooking query results.
+Reuses a stored result when a new query is a close paraphrase of a cached one.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.config import get_vector_config, get_logger
+from src.common.exceptions import VectorDatabaseError
+from src.vector.embeddings import RecipeEmbeddingGenerator
+from src.vector.store import get_chroma_client
+
+logger = get_logger(__name__)
+
+
+class SemanticQueryCache:
+    """
+    Query result cache keyed on query embeddings stored in Chroma DB.
+
+    A lookup embeds the query and returns the result of the nearest cached
+    query when their cosine similarity meets the threshold. Cache failures are
+    logged and treated as misses so they never block response generation.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, api_key: Optional[str] = None):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (defaults to config)
+            api_key: OpenAI API key for query embeddings
+        """
+        self.config = get_vector_config()
+        self.threshold = threshold if threshold is not None else self.config.SEMANTIC_CACHE_THRESHOLD
+        self.embedding_generator = RecipeEmbeddingGenerator(api_key)
+        self._collection = None
+
+    @property
+    def collection(self):
+        """
+        Get or create the query cache collection in ChromaDB.
+
+        Returns:
+            ChromaDB Collection instance using cosine distance
+
+        Raises:
+            VectorDatabaseError: If connection to ChromaDB fails
+        """
+        if self._collection is None:
+            try:
+                client = get_chroma_client(self.config.HOST, self.config.PORT)
+                self._collection = client.get_or_create_collection(
+                    name=self.config.SEMANTIC_CACHE_COLLECTION_NAME,
+                    metadata={"hnsw:space": "cosine"}
+                )
+            except Exception as e:
+                raise VectorDatabaseError(f"Failed to open semantic cache at {self.config.HOST}:{self.config.PORT}: {e}") from e
+        return self._collection
+
+    def get(self, query: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        Look up a cached result for a semantically similar query.
+
+        Args:
+            query: User query text
+
+        Returns:
+            Tuple of the cached result (None on a miss) and the query embedding
+            (None if embedding failed), which put() can reuse after a miss
+        """
+        embedding = None
+        try:
+            embedding = self.embedding_generator.generate_embedding(query)
+            results = self.collection.query(query_embeddings=[embedding], n_results=1)
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None, embedding
+
+        if not results['ids'] or not results['ids'][0]:
+            return None, embedding
+
+        # Chroma cosine distance is 1 - cosine similarity
+        distance = results['distances'][0][0]
+        if distance > 1 - self.threshold:
+            return None, embedding
+
+        logger.debug("Semantic cache hit for '%s' (distance %.4f)", query, distance)
+        return json.loads(results['metadatas'][0][0]['result']), embedding
+
+    def put(self, query: str, result: Dict[str, Any], embedding: Optional[List[float]] = None) -> None:
+        """
+        Store a result for a query.
+
+        Args:
+            query: User query text
+            result: JSON-serializable result to return for similar queries
+            embedding: Query embedding from get(), generated if not given
+        """
+        try:
+            if embedding is None:
+                embedding = self.embedding_generator.generate_embedding(query)
+            self.collection.upsert(
+                ids=[hashlib.sha256(query.encode()).hexdigest()[:16]],
+                embeddings=[embedding],
+                documents=[query],
+                metadatas=[{'result': json.dumps(result)}]
+            )
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
@@ -1,7 +1,12 @@
+from typing import Dict, Optional
 from openai import OpenAI
 from .models import SafetyValidation, Recipe
 from src.common.exceptions import SafetyValidationError
+from src.common.config import get_openai_config, get_recipe_config
+from src.common.utils import get_http_client
+import hashlib
 import json
+import os
 
 SAFETY_PROMPT = """Analyze this recipe for safety issues:
 
@@ -22,13 +27,37 @@ Return JSON in this exact format:
 
 Return only the JSON, no other text."""
 
+# Reused decoder for model responses, avoids per-call lookup of the default decoder
+_JSON_DECODE = json.JSONDecoder().decode
+
+# Module-level client so HTTP connections are reused across validations
+_client: Optional[OpenAI] = None
+
+# Results of earlier validations keyed by recipe content hash, oldest first
+_safety_cache: Dict[str, SafetyValidation] = {}
+
+
+def _get_client() -> OpenAI:
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), http_client=get_http_client())
+    return _client
+
+
+def _recipe_content_key(recipe: Recipe) -> str:
+    content = json.dumps([recipe.title, recipe.ingredients, recipe.instructions])
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
 def validate_recipe_safety(recipe: Recipe) -> SafetyValidation:
     """
     Validate recipe safety using AI analysis to identify potential hazards.
     
     Uses OpenAI GPT-3.5-turbo to analyze recipe ingredients, instructions, and cooking 
     methods for potential safety issues including dangerous ingredient combinations,
-    unsafe cooking temperatures, and missing critical safety steps.
+    unsafe cooking temperatures, and missing critical safety steps. Results are
+    cached per process by recipe content, so re-validating an identical recipe
+    does not make another API call.
     
     Args:
         recipe: Recipe object to validate for safety
@@ -39,8 +68,13 @@ def validate_recipe_safety(recipe: Recipe) -> SafetyValidation:
     Raises:
         SafetyValidationError: If validation fails or response cannot be parsed
     """
+    cache_key = _recipe_content_key(recipe)
+    cached = _safety_cache.get(cache_key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+    
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = _get_client()
         
         recipe_text = f"""
         Title: {recipe.title}
@@ -50,17 +84,24 @@ def validate_recipe_safety(recipe: Recipe) -> SafetyValidation:
         
         prompt = SAFETY_PROMPT.format(recipe=recipe_text)
         
+        openai_config = get_openai_config()
         response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=openai_config.SAFETY_MODEL,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.1  # Low temperature for consistent safety checking
+            temperature=openai_config.SAFETY_TEMPERATURE,  # Low temperature for consistent safety checking
+            response_format={"type": "json_object"}  # JSON mode: output is always parseable
         )
         
         safety_json = response.choices[0].message.content
-        safety_data = json.loads(safety_json)
-        return SafetyValidation(**safety_data)
+        safety_data = _JSON_DECODE(safety_json)
+        result = SafetyValidation(**safety_data)
         
     except json.JSONDecodeError as e:
         raise SafetyValidationError(f"Failed to parse safety validation JSON: {e}")
     except Exception as e:
-        raise SafetyValidationError(f"Safety validation failed: {e}")
\ No newline at end of file
+        raise SafetyValidationError(f"Safety validation failed: {e}")
+    
+    if len(_safety_cache) >= get_recipe_config().SAFETY_CACHE_SIZE:
+        _safety_cache.pop(next(iter(_safety_cache)))
+    _safety_cache[cache_key] = result.model_copy(deep=True)
+    return result
\ No newline at end of file
@@ -1,16 +1,35 @@
 """Vector database operations for semantic recipe search and RAG."""
 
-from .embeddings import RecipeEmbeddingGenerator, create_search_embedding
-from .store import VectorRecipeStore, VectorStoreError
+from importlib import import_module
+
 from .keywords import extract_recipe_keywords, extract_query_keywords, build_recipe_corpus
-from .filters import RecipeFilter, apply_metadata_filters
-from .user_collections import UserRecipeCollection, UserRecipeCollectionError
+from .filters import RecipeFilter, apply_metadata_filters, FilterValidationError
 from .types import (
     EmbeddingData, EmbeddingMetadata, SearchResult, RecipeMetadata, FilterDict, IngestionStats,
-    UserRecipe, UserRecipeMetadata
+    IngestionResult, UserRecipe, UserRecipeMetadata
 )
 # from .ingestion import RecipeIngestionPipeline, run_example_ingestion  # Commented to avoid circular imports
 
+# Names whose modules pull in the OpenAI SDK, Chroma DB or BM25 are loaded on
+# first access so importing filters or types stays cheap
+_LAZY_IMPORTS = {
+    'RecipeEmbeddingGenerator': '.embeddings',
+    'create_search_embedding': '.embeddings',
+    'VectorRecipeStore': '.store',
+    'VectorStoreError': '.store',
+    'UserRecipeCollection': '.user_collections',
+    'UserRecipeCollectionError': '.user_collections',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 __all__ = [
     'RecipeEmbeddingGenerator',
     'create_search_embedding',
@@ -21,6 +40,7 @@ __all__ = [
     'build_recipe_corpus',
     'RecipeFilter',
     'apply_metadata_filters',
+    'FilterValidationError',
     'UserRecipeCollection',
     'UserRecipeCollectionError',
     # Types
@@ -30,6 +50,7 @@ __all__ = [
     'RecipeMetadata',
     'FilterDict',
     'IngestionStats',
+    'IngestionResult',
     'UserRecipe',
     'UserRecipeMetadata',
     # 'RecipeIngestionPipeline',
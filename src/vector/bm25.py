@@ -0,0 +1,96 @@
+"""
+BM25 index over integer-encoded keyword corpora.
+Scores match rank_bm25's BM25Okapi while keeping term frequencies in int32 arrays.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def encode_corpus(corpus: List[List[str]]) -> Tuple[Dict[str, int], List[np.ndarray]]:
+    """
+    Map a tokenized corpus to integer token IDs.
+
+    Args:
+        corpus: List of keyword lists, one per document
+
+    Returns:
+        Tuple of the vocabulary (token to ID) and one int32 ID array per document
+    """
+    vocab: Dict[str, int] = {}
+    documents = [
+        np.fromiter((vocab.setdefault(token, len(vocab)) for token in tokens), dtype=np.int32, count=len(tokens))
+        for tokens in corpus
+    ]
+    return vocab, documents
+
+
+class BM25Index:
+    """
+    Okapi BM25 index stored as per-term posting lists.
+
+    Documents are encoded to token IDs once; each term keeps the int32 indices
+    of the documents containing it and its frequency in each, so scoring a
+    query touches only the postings of its terms instead of every document.
+    Negative IDF values are floored to epsilon times the average IDF, as in
+    rank_bm25.
+    """
+
+    def __init__(self, corpus: List[List[str]], k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        """
+        Build the index.
+
+        Args:
+            corpus: List of keyword lists, one per document
+            k1: Term frequency saturation parameter
+            b: Document length normalization parameter
+            epsilon: IDF floor as a fraction of the average IDF
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocab, documents = encode_corpus(corpus)
+        self.corpus_size = len(documents)
+
+        doc_len = np.fromiter((len(document) for document in documents), dtype=np.float64, count=self.corpus_size)
+        self.avgdl = doc_len.sum() / self.corpus_size
+        # Per-document part of the BM25 denominator, fixed once the corpus is known
+        self._length_norm = k1 * (1 - b + b * doc_len / self.avgdl)
+
+        # Sort (term, document) pairs so each term's postings are contiguous
+        vocab_size = len(self.vocab)
+        term_ids = np.concatenate(documents) if documents else np.empty(0, dtype=np.int32)
+        doc_ids = np.repeat(np.arange(self.corpus_size, dtype=np.int64), doc_len.astype(np.int64))
+        pairs, counts = np.unique(term_ids.astype(np.int64) * self.corpus_size + doc_ids, return_counts=True)
+        posting_terms = pairs // self.corpus_size
+        self._posting_docs = (pairs % self.corpus_size).astype(np.int32)
+        self._posting_freqs = counts.astype(np.float64)
+
+        doc_freq = np.bincount(posting_terms, minlength=vocab_size)
+        self._posting_starts = np.concatenate(([0], np.cumsum(doc_freq)))
+
+        idf = np.log(self.corpus_size - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        if vocab_size:
+            idf[idf < 0] = epsilon * idf.mean()
+        self.idf = idf
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """
+        Score every document against a query.
+
+        Args:
+            query: Query keywords; unknown keywords contribute nothing
+
+        Returns:
+            Array of BM25 scores in corpus order
+        """
+        scores = np.zeros(self.corpus_size)
+        for token in query:
+            term = self.vocab.get(token)
+            if term is None:
+                continue
+            start, end = self._posting_starts[term], self._posting_starts[term + 1]
+            docs = self._posting_docs[start:end]
+            freqs = self._posting_freqs[start:end]
+            scores[docs] += self.idf[term] * (freqs * (self.k1 + 1) / (freqs + self._length_norm[docs]))
+        return scores
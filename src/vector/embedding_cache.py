@@ -0,0 +1,111 @@
+"""
+Persistent embedding cache backed by SQLite.
+Lets re-ingestion of unchanged recipes skip the OpenAI embedding API.
+"""
+
+from array import array
+from typing import Dict, List
+import hashlib
+import os
+import sqlite3
+import threading
+
+from src.common.config import get_logger
+
+logger = get_logger(__name__)
+
+class EmbeddingCache:
+    """
+    On-disk store of embedding vectors keyed by model and text hash.
+
+    The database is opened on first use. Read and write failures are logged
+    and treated as cache misses so they never block embedding generation.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self._connection = None
+        # sqlite3 connections are shared across ingestion worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """
+        Build the cache key for a text embedded with a given model.
+
+        Args:
+            model: Embedding model name
+            text: Embedded text
+
+        Returns:
+            Hex digest identifying the model and text
+        """
+        return hashlib.sha256(f"{model}|{text}".encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+            )
+        return self._connection
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            keys: Cache keys from make_key
+
+        Returns:
+            Mapping of found keys to embedding vectors
+        """
+        if not keys:
+            return {}
+
+        found = {}
+        try:
+            with self._lock:
+                connection = self._connect()
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = connection.execute(
+                        f"SELECT key, embedding FROM embeddings WHERE key IN ({placeholders})", chunk
+                    )
+                    for key, blob in rows:
+                        found[key] = array('d', blob).tolist()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+        return found
+
+    def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings in the cache.
+
+        Args:
+            embeddings: Mapping of cache keys to embedding vectors
+        """
+        if not embeddings:
+            return
+
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                        [(key, array('d', embedding).tobytes()) for key, embedding in embeddings.items()]
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache write failed: {e}")
@@ -5,10 +5,14 @@ Handles text preparation and embedding creation for vector search.
 
 from openai import OpenAI
 from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import os
 from src.recipes.models import Recipe
 from src.common.config import get_vector_config, get_openai_config, get_logger
 from src.common.exceptions import EmbeddingGenerationError
+from src.common.utils import get_http_client
+from .embedding_cache import EmbeddingCache
+from .keywords import extract_recipe_keywords
 from .types import EmbeddingData, EmbeddingMetadata
 
 logger = get_logger(__name__)
@@ -16,22 +20,24 @@ logger = get_logger(__name__)
 class RecipeEmbeddingGenerator:
     """Generates embeddings for recipes using OpenAI's embedding model."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = None):
         """
         Initialize the embedding generator.
         
         Args:
             api_key: OpenAI API key. If None, will use environment variable.
+            cache_path: Optional SQLite file for caching embeddings across runs
         """
         self.vector_config = get_vector_config()
         self.openai_config = get_openai_config()
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
         
         # Initialize OpenAI client with proper v1.x pattern
         if api_key:
-            self.client = OpenAI(api_key=api_key)
+            self.client = OpenAI(api_key=api_key, http_client=get_http_client())
         else:
             # This will automatically use OPENAI_API_KEY environment variable
-            self.client = OpenAI()
+            self.client = OpenAI(http_client=get_http_client())
         
         logger.info(f"Initialized RecipeEmbeddingGenerator with model: {self.vector_config.EMBEDDING_MODEL}")
     
@@ -45,29 +51,32 @@ class RecipeEmbeddingGenerator:
         Returns:
             Formatted text string optimized for semantic search
         """
-        # Create comprehensive text that captures the recipe's essence
-        components = [
-            f"Recipe: {recipe.title}",
-            f"Difficulty: {recipe.difficulty}",
-            f"Cooking time: {recipe.prep_time} minutes prep, {recipe.cook_time} minutes cook",
-            f"Serves {recipe.servings} people",
-            f"Ingredients: {' | '.join(recipe.ingredients)}",
+        # Create comprehensive text that captures the recipe's essence,
+        # formatted as a single string rather than joined line by line
+        full_text = (
+            f"Recipe: {recipe.title}\n"
+            f"Difficulty: {recipe.difficulty}\n"
+            f"Cooking time: {recipe.prep_time} minutes prep, {recipe.cook_time} minutes cook\n"
+            f"Serves {recipe.servings} people\n"
+            f"Ingredients: {' | '.join(recipe.ingredients)}\n"
             f"Instructions: {' '.join(recipe.instructions)}"
-        ]
-        
-        full_text = "\n".join(components)
+        )
         
         # Log text length for monitoring
         logger.debug(f"Prepared text for '{recipe.title}': {len(full_text)} characters")
         
         return full_text
     
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embedding(self, text: str, use_cache: bool = False) -> List[float]:
         """
         Generate embedding for a text string using OpenAI API.
         
+        Only recipe texts go through the on-disk cache; one-off texts such as
+        search queries are embedded without being stored.
+        
         Args:
             text: Text to embed
+            use_cache: Whether to read and write the on-disk embedding cache
             
         Returns:
             List of embedding values
@@ -75,6 +84,13 @@ class RecipeEmbeddingGenerator:
         Raises:
             EmbeddingGenerationError: If OpenAI API call fails
         """
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cache_key = EmbeddingCache.make_key(self.vector_config.EMBEDDING_MODEL, text)
+            cached = self.cache.get_many([cache_key])
+            if cached:
+                return cached[cache_key]
+        
         try:
             logger.debug(f"Generating embedding for text of length {len(text)}")
             
@@ -86,32 +102,54 @@ class RecipeEmbeddingGenerator:
             embedding = response.data[0].embedding
             
             logger.debug(f"Generated embedding with dimension {len(embedding)}")
-            return embedding
             
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise EmbeddingGenerationError(f"OpenAI embedding generation failed: {e}") from e
+        
+        if use_cache:
+            self.cache.put_many({cache_key: embedding})
+        return embedding
     
-    def generate_recipe_embedding(self, recipe: Recipe) -> EmbeddingData:
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embedding and metadata for a recipe.
+        Generate embeddings for several texts in a single API request.
         
         Args:
-            recipe: Recipe to embed
+            texts: Texts to embed
             
         Returns:
-            Dictionary with embedding, text, and metadata
+            Embedding vectors in the same order as texts
+            
+        Raises:
+            EmbeddingGenerationError: If the API call fails or returns the wrong number of embeddings
         """
-        logger.info(f"Generating embedding for recipe: {recipe.title}")
-        
-        # Prepare optimized text
-        recipe_text = self.prepare_recipe_text(recipe)
+        try:
+            response = self.client.embeddings.create(
+                model=self.vector_config.EMBEDDING_MODEL,
+                input=texts
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate batch embedding: {e}")
+            raise EmbeddingGenerationError(f"OpenAI embedding generation failed: {e}") from e
         
-        # Generate embedding
-        embedding = self.generate_embedding(recipe_text)
+        if len(response.data) != len(texts):
+            raise EmbeddingGenerationError(
+                f"Expected {len(texts)} embeddings, got {len(response.data)}"
+            )
+        return [item.embedding for item in response.data]
+    
+    def build_recipe_metadata(self, recipe: Recipe) -> EmbeddingMetadata:
+        """
+        Build the vector database metadata stored alongside a recipe embedding.
         
-        # Prepare metadata for vector database
-        metadata = {
+        Args:
+            recipe: Recipe to describe
+            
+        Returns:
+            Metadata dictionary for the recipe
+        """
+        return {
             "title": recipe.title,
             "difficulty": recipe.difficulty,
             "prep_time": recipe.prep_time,
@@ -119,13 +157,33 @@ class RecipeEmbeddingGenerator:
             "total_time": recipe.total_time,
             "servings": recipe.servings,
             "ingredient_count": len(recipe.ingredients),
-            "instruction_count": len(recipe.instructions)
+            "instruction_count": len(recipe.instructions),
+            # Stored so the BM25 index can be rebuilt without re-tokenizing
+            "keywords": ' '.join(extract_recipe_keywords(recipe))
         }
+    
+    def generate_recipe_embedding(self, recipe: Recipe) -> EmbeddingData:
+        """
+        Generate embedding and metadata for a recipe.
+        
+        Args:
+            recipe: Recipe to embed
+            
+        Returns:
+            Dictionary with embedding, text, and metadata
+        """
+        logger.info(f"Generating embedding for recipe: {recipe.title}")
+        
+        # Prepare optimized text
+        recipe_text = self.prepare_recipe_text(recipe)
+        
+        # Generate embedding
+        embedding = self.generate_embedding(recipe_text, use_cache=True)
         
         result = {
             "embedding": embedding,
             "text": recipe_text,
-            "metadata": metadata,
+            "metadata": self.build_recipe_metadata(recipe),
             "recipe": recipe
         }
         
@@ -136,6 +194,12 @@ class RecipeEmbeddingGenerator:
         """
         Generate embeddings for multiple recipes.
         
+        Texts are sent in batches of EMBEDDING_BATCH_SIZE per API request, with
+        up to MAX_CONCURRENT_BATCHES requests in flight at once; each batch's
+        texts are prepared while earlier batches are being embedded. If a
+        batch request fails, its recipes are embedded one at a time. When a
+        cache is configured, only texts without a cached embedding are sent.
+        
         Args:
             recipes: List of recipes to embed
             
@@ -144,17 +208,69 @@ class RecipeEmbeddingGenerator:
         """
         logger.info(f"Generating embeddings for {len(recipes)} recipes")
         
-        results = []
-        for i, recipe in enumerate(recipes, 1):
-            try:
-                result = self.generate_recipe_embedding(recipe)
-                results.append(result)
-                logger.debug(f"Completed {i}/{len(recipes)}: {recipe.title}")
+        texts = []
+        cache_keys = []
+        embeddings_by_index = {}
+        batches = []
+        futures = []
+        batch_size = self.vector_config.EMBEDDING_BATCH_SIZE
+        
+        # Batch requests are network-bound, so overlap them; the shared
+        # OpenAI client is thread-safe
+        with ThreadPoolExecutor(max_workers=self.vector_config.MAX_CONCURRENT_BATCHES) as executor:
+            # Prepare texts one batch at a time and submit each batch as soon
+            # as it is ready, so text preparation overlaps with the requests
+            # already in flight
+            for start in range(0, len(recipes), batch_size):
+                batch_texts = [self.prepare_recipe_text(recipe) for recipe in recipes[start:start + batch_size]]
+                texts.extend(batch_texts)
+                batch = list(range(start, start + len(batch_texts)))
+                
+                # Serve unchanged recipes from the cache and only send the rest to the API
+                if self.cache is not None:
+                    batch_keys = [EmbeddingCache.make_key(self.vector_config.EMBEDDING_MODEL, text) for text in batch_texts]
+                    cache_keys.extend(batch_keys)
+                    cached = self.cache.get_many(batch_keys)
+                    for i, key in zip(batch, batch_keys):
+                        if key in cached:
+                            embeddings_by_index[i] = cached[key]
+                    batch = [i for i in batch if i not in embeddings_by_index]
                 
-            except EmbeddingGenerationError as e:
-                logger.error(f"Failed to generate embedding for '{recipe.title}': {e}")
-                # Continue with other recipes instead of failing completely
-                continue
+                if batch:
+                    batches.append(batch)
+                    futures.append(executor.submit(self.generate_embeddings, [texts[i] for i in batch]))
+            
+            if self.cache is not None:
+                logger.debug(f"Embedding cache hits: {len(embeddings_by_index)}/{len(recipes)}")
+            
+            new_embeddings = {}
+            for batch, future in zip(batches, futures):
+                try:
+                    new_embeddings.update(zip(batch, future.result()))
+                except EmbeddingGenerationError as e:
+                    logger.warning(f"Batch embedding failed, falling back to individual requests: {e}")
+        
+        if self.cache is not None:
+            self.cache.put_many({cache_keys[i]: embedding for i, embedding in new_embeddings.items()})
+        embeddings_by_index.update(new_embeddings)
+        
+        results = []
+        for i, (recipe, text) in enumerate(zip(recipes, texts)):
+            embedding = embeddings_by_index.get(i)
+            if embedding is None:
+                try:
+                    embedding = self.generate_embedding(text, use_cache=True)
+                except EmbeddingGenerationError as e:
+                    logger.error(f"Failed to generate embedding for '{recipe.title}': {e}")
+                    # Continue with other recipes instead of failing completely
+                    continue
+            
+            results.append({
+                "embedding": embedding,
+                "text": text,
+                "metadata": self.build_recipe_metadata(recipe),
+                "recipe": recipe
+            })
         
         logger.info(f"Successfully generated {len(results)} embeddings out of {len(recipes)} recipes")
         return results
@@ -2,18 +2,36 @@
 Recipe filtering utilities for vector search operations.
 """
 
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Tuple
+from dataclasses import dataclass, field
+import re
+import numpy as np
 
 from src.common.config import get_vector_config
 from src.common.exceptions import CookingAssistantError
-from .types import SearchResult
+from .types import RecipeMetadata, SearchResult
 
 class FilterValidationError(CookingAssistantError):
     """Exception raised for filter validation errors."""
     pass
 
-@dataclass
+# Ingredients that rule out the vegetarian heuristic, matched in one scan
+_MEAT_PATTERN = re.compile('meat|chicken|beef')
+
+# Supported values as sets, built from config on first validation
+_supported_difficulties: Optional[FrozenSet[str]] = None
+_supported_dietary_restrictions: Optional[FrozenSet[str]] = None
+
+
+def _get_supported_values() -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    global _supported_difficulties, _supported_dietary_restrictions
+    if _supported_difficulties is None:
+        config = get_vector_config()
+        _supported_difficulties = frozenset(config.SUPPORTED_DIFFICULTIES)
+        _supported_dietary_restrictions = frozenset(r.lower() for r in config.SUPPORTED_DIETARY_RESTRICTIONS)
+    return _supported_difficulties, _supported_dietary_restrictions
+
+@dataclass(slots=True)
 class RecipeFilter:
     """Recipe filter for search operations."""
     difficulty: Optional[str] = None
@@ -25,6 +43,9 @@ class RecipeFilter:
     servings_max: Optional[int] = None
     dietary_restrictions: Optional[List[str]] = None
     max_total_time: Optional[int] = None
+    # Any requested restriction as one alternation, compiled once per filter
+    _dietary_pattern: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+    _includes_vegetarian: bool = field(default=False, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """
@@ -36,10 +57,10 @@ class RecipeFilter:
         Raises:
             FilterValidationError: If any filter parameters are invalid
         """
-        config = get_vector_config()
+        supported_difficulties, supported_dietary_restrictions = _get_supported_values()
         
         # Validate difficulty
-        if self.difficulty and self.difficulty not in config.SUPPORTED_DIFFICULTIES:
+        if self.difficulty and self.difficulty not in supported_difficulties:
             raise FilterValidationError(f"Invalid difficulty '{self.difficulty}'")
         
         # Validate ranges
@@ -53,8 +74,12 @@ class RecipeFilter:
         # Validate dietary restrictions
         if self.dietary_restrictions:
             for restriction in self.dietary_restrictions:
-                if restriction.lower() not in [r.lower() for r in config.SUPPORTED_DIETARY_RESTRICTIONS]:
+                if restriction.lower() not in supported_dietary_restrictions:
                     raise FilterValidationError(f"Invalid dietary restriction '{restriction}'")
+            
+            restrictions_lower = [restriction.lower() for restriction in self.dietary_restrictions]
+            self._dietary_pattern = re.compile('|'.join(map(re.escape, restrictions_lower)))
+            self._includes_vegetarian = 'vegetarian' in restrictions_lower
     
     def has_filters(self) -> bool:
         """
@@ -63,14 +88,58 @@ class RecipeFilter:
         Returns:
             True if any filter parameters are set, False if all are None
         """
-        return any([
-            self.difficulty is not None,
-            self.prep_time_min is not None, self.prep_time_max is not None,
-            self.cook_time_min is not None, self.cook_time_max is not None,
-            self.servings_min is not None, self.servings_max is not None,
-            self.dietary_restrictions is not None,
-            self.max_total_time is not None
-        ])
+        return (
+            self.difficulty is not None
+            or self.prep_time_min is not None or self.prep_time_max is not None
+            or self.cook_time_min is not None or self.cook_time_max is not None
+            or self.servings_min is not None or self.servings_max is not None
+            or self.dietary_restrictions is not None
+            or self.max_total_time is not None
+        )
+
+
+# Numeric metadata fields parsed for filtering, in column order
+_NUMERIC_FIELDS = ('prep_time', 'cook_time', 'servings')
+
+
+def _numeric_columns(metadatas: List[RecipeMetadata]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the numeric metadata fields of all results in a single pass.
+    
+    Missing values become NaN so range comparisons against them are False.
+    Recipe metadata is stored with int fields, so those are taken as-is and
+    only legacy values (e.g. numeric strings) go through int().
+    
+    Returns:
+        Tuple of (values, invalid): an (N, 3) float array in _NUMERIC_FIELDS
+        order, and a mask of results holding a value int() rejects
+    """
+    values = np.full((len(metadatas), len(_NUMERIC_FIELDS)), np.nan)
+    invalid = np.zeros(len(metadatas), dtype=bool)
+    for i, metadata in enumerate(metadatas):
+        row = values[i]
+        for j, field_name in enumerate(_NUMERIC_FIELDS):
+            value = metadata.get(field_name)
+            if value is None:
+                continue
+            if type(value) is int:
+                row[j] = value
+                continue
+            try:
+                row[j] = int(value)
+            except (ValueError, TypeError):
+                invalid[i] = True
+    return values, invalid
+
+
+def _matches_dietary_restrictions(metadata: RecipeMetadata, filters: RecipeFilter) -> bool:
+    """Check a recipe's title and ingredients against the filter's dietary restrictions."""
+    recipe_text = f"{metadata.get('title', '')} {' '.join(metadata.get('ingredients', []))}".lower()
+    
+    if filters._dietary_pattern.search(recipe_text):
+        return True
+    # Simple heuristics for common dietary restrictions
+    return filters._includes_vegetarian and not _MEAT_PATTERN.search(recipe_text)
 
 
 def apply_metadata_filters(search_results: List[SearchResult], 
@@ -82,6 +151,11 @@ def apply_metadata_filters(search_results: List[SearchResult],
     dietary restrictions, and maximum total time. Handles both sparse
     and dense search result formats.
     
+    Filters run cheapest first, and each stage only sees the results that
+    survived the previous one: the difficulty equality check, then the
+    numeric fields, parsed into NumPy columns and compared as a single
+    boolean mask, then the string-based dietary check.
+    
     Args:
         search_results: List of search results to filter
         filters: RecipeFilter object with filtering criteria
@@ -92,85 +166,39 @@ def apply_metadata_filters(search_results: List[SearchResult],
     if not filters or not filters.has_filters():
         return search_results
     
-    filtered_results = []
+    # Extract metadata - handle both sparse and dense result formats
+    metadatas = [result.get('metadata') or result.get('recipe', {}) for result in search_results]
     
-    for result in search_results:
-        # Extract metadata - handle both sparse and dense result formats
-        metadata = result.get('metadata') or result.get('recipe', {})
-        if not metadata:
-            continue
-        
-        # Apply difficulty filter
-        if filters.difficulty and metadata.get('difficulty') != filters.difficulty:
-            continue
-        
-        # Apply time range filters
-        prep_time = metadata.get('prep_time')
-        if prep_time is not None:
-            try:
-                prep_time = int(prep_time)
-                if filters.prep_time_min is not None and prep_time < filters.prep_time_min:
-                    continue
-                if filters.prep_time_max is not None and prep_time > filters.prep_time_max:
-                    continue
-            except (ValueError, TypeError):
-                continue
-        
-        cook_time = metadata.get('cook_time')  
-        if cook_time is not None:
-            try:
-                cook_time = int(cook_time)
-                if filters.cook_time_min is not None and cook_time < filters.cook_time_min:
-                    continue
-                if filters.cook_time_max is not None and cook_time > filters.cook_time_max:
-                    continue
-            except (ValueError, TypeError):
-                continue
-        
-        # Apply servings filter
-        servings = metadata.get('servings')
-        if servings is not None:
-            try:
-                servings = int(servings)
-                if filters.servings_min is not None and servings < filters.servings_min:
-                    continue
-                if filters.servings_max is not None and servings > filters.servings_max:
-                    continue
-            except (ValueError, TypeError):
-                continue
-        
-        # Apply dietary restrictions filter
-        if filters.dietary_restrictions:
-            recipe_text = " ".join([
-                metadata.get('title', '').lower(),
-                " ".join(metadata.get('ingredients', [])).lower()
-            ])
-            
-            dietary_match = False
-            for restriction in filters.dietary_restrictions:
-                restriction_lower = restriction.lower()
-                if restriction_lower in recipe_text:
-                    dietary_match = True
-                    break
-                # Simple heuristics for common dietary restrictions
-                if restriction_lower == 'vegetarian' and not any(meat in recipe_text for meat in ['meat', 'chicken', 'beef']):
-                    dietary_match = True
-                    break
-            
-            if not dietary_match:
-                continue
-        
-        # Apply max total time filter
-        if filters.max_total_time is not None:
-            try:
-                total_time = int(metadata.get('prep_time', 0)) + int(metadata.get('cook_time', 0))
-                if total_time > filters.max_total_time:
-                    continue
-            except (ValueError, TypeError):
-                continue
-        
-        filtered_results.append(result)
+    # Apply difficulty filter, dropping results without metadata
+    difficulty = filters.difficulty
+    candidates = np.array([
+        i for i, metadata in enumerate(metadatas)
+        if metadata and (not difficulty or metadata.get('difficulty') == difficulty)
+    ], dtype=np.intp)
     
-    return filtered_results
-
-
+    # Values that cannot be read as integers exclude the result outright
+    columns, invalid = _numeric_columns([metadatas[i] for i in candidates])
+    mask = ~invalid
+    
+    # Apply all range filters in one fused comparison. Unset bounds become
+    # NaN, and so do missing values; any comparison with NaN is False, so
+    # neither can fail a range. Skipped entirely when no bound is set
+    lower = np.array([filters.prep_time_min, filters.cook_time_min, filters.servings_min], dtype=float)
+    upper = np.array([filters.prep_time_max, filters.cook_time_max, filters.servings_max], dtype=float)
+    if not (np.isnan(lower).all() and np.isnan(upper).all()):
+        mask &= ~((columns < lower) | (columns > upper)).any(axis=1)
+    
+    # Apply max total time filter from the already-parsed times, counting
+    # missing times as zero
+    if filters.max_total_time is not None:
+        mask &= np.nansum(columns[:, :2], axis=1) <= filters.max_total_time
+    
+    # The dietary filter is the most expensive, so it runs last
+    survivors = candidates[mask]
+    if not filters.dietary_restrictions:
+        return [search_results[i] for i in survivors]
+    
+    return [
+        search_results[i] for i in survivors
+        if _matches_dietary_restrictions(metadatas[i], filters)
+    ]
@@ -3,20 +3,28 @@ Recipe ingestion pipeline for loading recipes into vector database.
 Handles batch processing and data migration from example recipes.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 import hashlib
 import json
+import time
 
 from src.recipes.models import Recipe
 from src.prompting.examples import load_example_recipes
 from .store import VectorRecipeStore, VectorStoreError
-from .types import IngestionStats
-from src.common.exceptions import EmbeddingGenerationError
-from src.common.config import get_logger
+from .embedding_cache import EmbeddingCache
+from .types import IngestionResult, IngestionStats
+from src.common.exceptions import EmbeddingGenerationError, PartialWriteError
+from src.common.config import get_vector_config, get_logger
 
 logger = get_logger(__name__)
 
+# Reused decoder for Batch API output lines
+_JSON_DECODE = json.JSONDecoder().decode
+
 class RecipeIngestionPipeline:
     """Pipeline for ingesting recipes into the vector database."""
     
@@ -28,67 +36,73 @@ class RecipeIngestionPipeline:
             api_key: OpenAI API key for embeddings
             collection_name: Target collection name
         """
-        self.vector_store = VectorRecipeStore(api_key, collection_name)
-        self.stats = {
-            'processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'start_time': None,
-            'end_time': None
-        }
+        # Re-ingesting unchanged recipes reuses embeddings from the on-disk cache
+        self.vector_store = VectorRecipeStore(
+            api_key, collection_name, embedding_cache_path=get_vector_config().EMBEDDING_CACHE_PATH
+        )
+        self.stats = IngestionStats()
         
         logger.info("Initialized recipe ingestion pipeline")
     
-    def ingest_example_recipes(self, clear_existing: bool = False) -> IngestionStats:
+    def ingest_example_recipes(self, clear_existing: bool = False, use_batch_api: bool = False) -> IngestionResult:
         """
         Ingest recipes from data/example_recipes.json into vector database.
         
         Args:
             clear_existing: Whether to clear existing recipes first
+            use_batch_api: Whether a full re-ingestion of a large catalog may use
+                the OpenAI Batch API instead of synchronous embedding calls
             
         Returns:
             Dictionary with ingestion statistics
         """
-        self.stats['start_time'] = datetime.now()
+        self.stats = IngestionStats(start_time=datetime.now())
         logger.info("Starting ingestion of example recipes")
         
         try:
-            # Clear existing recipes if requested
-            if clear_existing:
-                logger.info("Clearing existing recipes from collection")
-                self.vector_store.clear_collection()
-            
             # Load example recipes
             logger.info("Loading example recipes from data/example_recipes.json")
             recipes = load_example_recipes()
             logger.info(f"Loaded {len(recipes)} example recipes")
             
-            # Generate recipe IDs based on titles (for consistency)
-            recipe_ids = [self._generate_recipe_id(recipe) for recipe in recipes]
+            # Offline re-ingestion of a large catalog can tolerate the Batch API
+            # queueing delay in exchange for lower cost. The existing recipes
+            # are only cleared once the embeddings are back
+            use_batch = (
+                use_batch_api and clear_existing
+                and len(recipes) > get_vector_config().BATCH_API_MIN_RECIPES
+            )
             
-            # Ingest recipes
-            result = self._ingest_recipes(recipes, recipe_ids)
+            if use_batch:
+                recipe_ids = [self._generate_recipe_id(recipe) for recipe in recipes]
+                result = self.ingest_via_batch_api(recipes, recipe_ids, clear_existing=True)
+            else:
+                # Clear existing recipes if requested
+                if clear_existing:
+                    logger.info("Clearing existing recipes from collection")
+                    self.vector_store.clear_collection()
+                result = self._ingest_in_chunks(recipes)
             
-            self.stats['end_time'] = datetime.now()
-            self.stats['duration'] = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
+            self.stats.end_time = datetime.now()
+            self.stats.duration = (self.stats.end_time - self.stats.start_time).total_seconds()
             
-            logger.info(f"Ingestion completed: {self.stats['successful']}/{self.stats['processed']} recipes successful")
+            logger.info(f"Ingestion completed: {self.stats.successful}/{self.stats.processed} recipes successful")
             return {
                 'status': 'completed',
-                'stats': self.stats,
+                'stats': asdict(self.stats),
                 'recipe_ids': result
             }
             
         except Exception as e:
-            self.stats['end_time'] = datetime.now()
+            self.stats.end_time = datetime.now()
             logger.error(f"Ingestion pipeline failed: {e}")
             return {
                 'status': 'failed',
                 'error': str(e),
-                'stats': self.stats
+                'stats': asdict(self.stats)
             }
     
-    def ingest_recipes(self, recipes: List[Recipe], recipe_ids: Optional[List[str]] = None) -> IngestionStats:
+    def ingest_recipes(self, recipes: List[Recipe], recipe_ids: Optional[List[str]] = None) -> IngestionResult:
         """
         Ingest a list of recipes into the vector database.
         
@@ -99,7 +113,7 @@ class RecipeIngestionPipeline:
         Returns:
             Dictionary with ingestion results
         """
-        self.stats['start_time'] = datetime.now()
+        self.stats = IngestionStats(start_time=datetime.now())
         logger.info(f"Starting ingestion of {len(recipes)} recipes")
         
         try:
@@ -110,24 +124,47 @@ class RecipeIngestionPipeline:
             # Ingest recipes
             result = self._ingest_recipes(recipes, recipe_ids)
             
-            self.stats['end_time'] = datetime.now()
-            self.stats['duration'] = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
+            self.stats.end_time = datetime.now()
+            self.stats.duration = (self.stats.end_time - self.stats.start_time).total_seconds()
             
             return {
-                'status': 'completed' if self.stats['successful'] > 0 else 'failed',
-                'stats': self.stats,
+                'status': 'completed' if self.stats.successful > 0 else 'failed',
+                'stats': asdict(self.stats),
                 'recipe_ids': result
             }
             
         except Exception as e:
-            self.stats['end_time'] = datetime.now()
+            self.stats.end_time = datetime.now()
             logger.error(f"Recipe ingestion failed: {e}")
             return {
                 'status': 'failed',
                 'error': str(e),
-                'stats': self.stats
+                'stats': asdict(self.stats)
             }
     
+    def _ingest_in_chunks(self, recipes: Iterable[Recipe]) -> List[str]:
+        """
+        Ingest recipes in fixed-size chunks.
+        
+        IDs are generated per chunk, and each chunk is embedded and written
+        before the next one is started.
+        
+        Args:
+            recipes: Iterable of recipes to ingest
+            
+        Returns:
+            List of successfully ingested recipe IDs
+        """
+        chunk_size = get_vector_config().INGESTION_CHUNK_SIZE
+        recipe_iter = iter(recipes)
+        successful_ids = []
+        
+        while chunk := list(islice(recipe_iter, chunk_size)):
+            chunk_ids = [self._generate_recipe_id(recipe) for recipe in chunk]
+            successful_ids.extend(self._ingest_recipes(chunk, chunk_ids))
+        
+        return successful_ids
+    
     def _ingest_recipes(self, recipes: List[Recipe], recipe_ids: List[str]) -> List[str]:
         """
         Internal method to handle recipe ingestion.
@@ -139,43 +176,211 @@ class RecipeIngestionPipeline:
         Returns:
             List of successfully ingested recipe IDs
         """
-        self.stats['processed'] = len(recipes)
-        successful_ids = []
+        self.stats.processed += len(recipes)
         
         try:
             # Use batch ingestion for efficiency
             logger.info("Starting batch ingestion...")
-            ingested_ids = self.vector_store.add_recipes(recipes, recipe_ids)
-            successful_ids.extend(ingested_ids)
-            self.stats['successful'] = len(ingested_ids)
-            self.stats['failed'] = len(recipes) - len(ingested_ids)
+            # The store's ID list is returned as-is rather than copied
+            successful_ids = self.vector_store.add_recipes(recipes, recipe_ids)
+            self.stats.successful += len(successful_ids)
+            self.stats.failed += len(recipes) - len(successful_ids)
             
-            logger.info(f"Batch ingestion completed: {len(ingested_ids)} recipes added")
+            logger.info(f"Batch ingestion completed: {len(successful_ids)} recipes added")
             
-        except VectorStoreError as e:
+        except EmbeddingGenerationError as e:
             logger.warning(f"Batch ingestion failed, falling back to individual ingestion: {e}")
+            successful_ids = self._ingest_individually(recipes, recipe_ids)
+            
+        except PartialWriteError as e:
+            # Earlier chunks are already stored, so only the rest are retried
+            logger.warning(f"Batch ingestion stopped after {len(e.added_ids)} recipes, retrying the rest individually: {e}")
+            self.stats.successful += len(e.added_ids)
+            added = set(e.added_ids)
+            missing = [(recipe, recipe_id) for recipe, recipe_id in zip(recipes, recipe_ids) if recipe_id not in added]
+            successful_ids = e.added_ids + self._ingest_individually(
+                [recipe for recipe, _ in missing], [recipe_id for _, recipe_id in missing]
+            )
+        
+        return successful_ids
+    
+    def _ingest_individually(self, recipes: List[Recipe], recipe_ids: List[str]) -> List[str]:
+        """
+        Embed recipes one request at a time, then add them in a single write.
+        
+        Several embedding round-trips are kept in flight at once since each
+        call is network-bound. Recipes that fail to embed are counted as
+        failed; vector database errors from the write are not caught.
+        
+        Args:
+            recipes: List of recipes to ingest
+            recipe_ids: List of recipe IDs
+            
+        Returns:
+            List of successfully ingested recipe IDs
+        """
+        config = get_vector_config()
+        generator = self.vector_store.embedding_generator
+        max_workers = max(1, min(config.INGESTION_MAX_WORKERS, len(recipes)))
+        embedded = []
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(generator.generate_recipe_embedding, recipe) for recipe in recipes]
             
-            # Fall back to individual ingestion
-            for i, (recipe, recipe_id) in enumerate(zip(recipes, recipe_ids)):
+            # Count failures in a local and fold into the stats once the loop is done
+            failed = 0
+            already_done = self.stats.successful + self.stats.failed
+            for i, (recipe, recipe_id, future) in enumerate(zip(recipes, recipe_ids, futures)):
                 try:
-                    ingested_id = self.vector_store.add_recipe(recipe, recipe_id)
-                    successful_ids.append(ingested_id)
-                    self.stats['successful'] += 1
-                    logger.debug(f"Successfully ingested recipe {i+1}/{len(recipes)}: {recipe.title}")
+                    embedded.append((recipe_id, future.result()))
+                    # Lazy %-formatting: skipped entirely unless debug logging is on
+                    logger.debug("Embedded recipe %d/%d: %s", i + 1, len(recipes), recipe.title)
                     
-                except (VectorStoreError, EmbeddingGenerationError) as recipe_error:
-                    self.stats['failed'] += 1
-                    logger.error(f"Failed to ingest recipe '{recipe.title}': {recipe_error}")
-                    continue
+                except EmbeddingGenerationError as recipe_error:
+                    failed += 1
+                    logger.error("Failed to embed recipe '%s': %s", recipe.title, recipe_error)
+                
+                done = already_done + i + 1
+                if done % config.INGESTION_PROGRESS_INTERVAL == 0:
+                    logger.info("Embedded %d recipes so far (%d failed)", done, self.stats.failed + failed)
         
+        successful_ids = []
+        if embedded:
+            successful_ids = self.vector_store.add_embeddings(
+                recipe_ids=[recipe_id for recipe_id, _ in embedded],
+                embeddings=[data["embedding"] for _, data in embedded],
+                documents=[data["text"] for _, data in embedded],
+                metadatas=[data["metadata"] for _, data in embedded]
+            )
+        
+        self.stats.successful += len(successful_ids)
+        self.stats.failed += len(recipes) - len(successful_ids)
         return successful_ids
     
+    def ingest_via_batch_api(self, recipes: List[Recipe], recipe_ids: List[str],
+                             clear_existing: bool = False) -> List[str]:
+        """
+        Ingest recipes using the OpenAI Batch API for embedding generation.
+        
+        Recipes with an embedding in the generator's cache are not resubmitted.
+        The rest are uploaded as one embedding request per recipe in a JSONL
+        file; once the batch completes, all embeddings are added to the
+        vector store in a single write.
+        
+        Args:
+            recipes: List of recipes to ingest
+            recipe_ids: List of recipe IDs
+            clear_existing: Whether to clear existing recipes after the
+                embeddings are fetched and before they are written
+            
+        Returns:
+            List of successfully ingested recipe IDs
+            
+        Raises:
+            VectorStoreError: If the batch does not complete successfully
+        """
+        config = get_vector_config()
+        generator = self.vector_store.embedding_generator
+        self.stats.processed += len(recipes)
+        
+        texts = {recipe_id: generator.prepare_recipe_text(recipe) for recipe, recipe_id in zip(recipes, recipe_ids)}
+        
+        embeddings_by_id = {}
+        cache_keys = {}
+        if generator.cache is not None:
+            cache_keys = {
+                recipe_id: EmbeddingCache.make_key(config.EMBEDDING_MODEL, text) for recipe_id, text in texts.items()
+            }
+            cached = generator.cache.get_many(list(cache_keys.values()))
+            embeddings_by_id = {recipe_id: cached[key] for recipe_id, key in cache_keys.items() if key in cached}
+            logger.debug("Embedding cache hits: %d/%d", len(embeddings_by_id), len(texts))
+        
+        pending = {recipe_id: text for recipe_id, text in texts.items() if recipe_id not in embeddings_by_id}
+        if pending:
+            new_embeddings = self._run_embedding_batch(pending)
+            if generator.cache is not None:
+                generator.cache.put_many({cache_keys[recipe_id]: embedding for recipe_id, embedding in new_embeddings.items()})
+            embeddings_by_id.update(new_embeddings)
+        
+        if clear_existing:
+            logger.info("Clearing existing recipes from collection")
+            self.vector_store.clear_collection()
+        
+        # Keep input order for the recipes that were embedded
+        embedded = [(recipe, recipe_id) for recipe, recipe_id in zip(recipes, recipe_ids) if recipe_id in embeddings_by_id]
+        successful_ids = []
+        if embedded:
+            successful_ids = self.vector_store.add_embeddings(
+                recipe_ids=[recipe_id for _, recipe_id in embedded],
+                embeddings=[embeddings_by_id[recipe_id] for _, recipe_id in embedded],
+                documents=[texts[recipe_id] for _, recipe_id in embedded],
+                metadatas=[generator.build_recipe_metadata(recipe) for recipe, _ in embedded]
+            )
+        
+        self.stats.successful += len(successful_ids)
+        self.stats.failed += len(recipes) - len(successful_ids)
+        logger.info(f"Batch API ingestion completed: {len(successful_ids)} recipes added")
+        return successful_ids
+    
+    def _run_embedding_batch(self, texts: Dict[str, str]) -> Dict[str, List[float]]:
+        """
+        Embed texts with one OpenAI Batch API job and wait for the results.
+        
+        Args:
+            texts: Texts to embed keyed by recipe ID
+            
+        Returns:
+            Embeddings keyed by recipe ID, for the requests that succeeded
+            
+        Raises:
+            VectorStoreError: If the batch does not complete successfully
+        """
+        config = get_vector_config()
+        client = self.vector_store.embedding_generator.client
+        requests = "\n".join(
+            json.dumps({
+                "custom_id": recipe_id,
+                "method": "POST",
+                "url": "/v1/embeddings",
+                "body": {"model": config.EMBEDDING_MODEL, "input": text}
+            })
+            for recipe_id, text in texts.items()
+        )
+        
+        input_file = client.files.create(file=("recipe_embeddings.jsonl", requests.encode()), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/embeddings",
+            completion_window=config.BATCH_API_COMPLETION_WINDOW
+        )
+        logger.info(f"Submitted embedding batch {batch.id} for {len(texts)} recipes")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(config.BATCH_API_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
+            logger.debug(f"Embedding batch {batch.id} status: {batch.status}")
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise VectorStoreError(f"Embedding batch {batch.id} finished with status '{batch.status}'")
+        
+        embeddings_by_id = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            output = _JSON_DECODE(line)
+            response = output.get("response") or {}
+            if response.get("status_code") == 200:
+                embeddings_by_id[output["custom_id"]] = response["body"]["data"][0]["embedding"]
+        return embeddings_by_id
+    
     def _generate_recipe_id(self, recipe: Recipe) -> str:
         """
         Generate unique, deterministic ID based on recipe content.
         
         Uses SHA256 hash of key recipe attributes to ensure uniqueness
-        while maintaining deterministic behavior for the same recipe.
+        while maintaining deterministic behavior for the same recipe. The
+        title is hashed verbatim, so titles that differ only in case or
+        punctuation do not collide.
         
         Args:
             recipe: Recipe object
@@ -198,11 +403,11 @@ class RecipeIngestionPipeline:
         
         return f"recipe_{content_hash}"
     
-    def get_ingestion_stats(self) -> IngestionStats:
+    def get_ingestion_stats(self) -> Dict[str, Any]:
         """Get current ingestion statistics."""
-        return self.stats.copy()
+        return asdict(self.stats)
     
-    def verify_ingestion(self) -> IngestionStats:
+    def verify_ingestion(self) -> Dict[str, Any]:
         """
         Verify the ingestion by checking recipes in the database.
         
@@ -234,7 +439,7 @@ class RecipeIngestionPipeline:
                 'error': str(e)
             }
 
-def run_example_ingestion(api_key: Optional[str] = None, clear_existing: bool = True) -> IngestionStats:
+def run_example_ingestion(api_key: Optional[str] = None, clear_existing: bool = True) -> IngestionResult:
     """
     Convenience function to run example recipe ingestion.
     
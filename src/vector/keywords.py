@@ -4,18 +4,33 @@ Provides text preprocessing and tokenization for BM25 search.
 """
 
 import re
-from typing import List, Set
+import sys
+from itertools import chain
+from typing import Dict, Iterable, List, Pattern, Set
 from src.recipes.models import Recipe
 from src.common.config import get_vector_config, get_logger
 
 logger = get_logger(__name__)
 
 # Common English stopwords for recipe text
-COOKING_STOPWORDS = {
+COOKING_STOPWORDS = frozenset({
     'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'he', 
     'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to', 'was', 'will', 'with',
     'add', 'then', 'into', 'over', 'until', 'about', 'all', 'also', 'can', 'or'
-}
+})
+
+# Tokens are runs of ASCII letters and digits in lowercased text
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Keyword patterns compiled per minimum keyword length
+_keyword_patterns: Dict[int, Pattern[str]] = {}
+
+
+def _get_keyword_pattern(min_length: int) -> Pattern[str]:
+    pattern = _keyword_patterns.get(min_length)
+    if pattern is None:
+        pattern = _keyword_patterns[min_length] = re.compile(r'[a-z0-9]{%d,}' % max(min_length, 1))
+    return pattern
 
 def extract_recipe_keywords(recipe: Recipe) -> List[str]:
     """
@@ -27,32 +42,11 @@ def extract_recipe_keywords(recipe: Recipe) -> List[str]:
     Returns:
         List of keywords (tokens) for BM25 indexing
     """
-    config = get_vector_config()
-    
-    # Combine all text content from recipe
-    text_content = []
-    
-    # Add title (with higher weight by repeating)
-    text_content.extend([recipe.title] * 2)
-    
-    # Add ingredients
-    text_content.extend(recipe.ingredients)
-    
-    # Add instructions
-    text_content.extend(recipe.instructions)
-    
-    # Join all content
-    full_text = ' '.join(text_content)
-    
-    # Tokenize and clean
-    tokens = tokenize_text(full_text)
-    
-    # Filter by length and stopwords
-    keywords = []
-    for token in tokens:
-        if len(token) >= config.MIN_KEYWORD_LENGTH:
-            if not config.STOPWORDS_ENABLED or token.lower() not in COOKING_STOPWORDS:
-                keywords.append(token.lower())
+    # Tokenize each field in turn rather than joining them into one string;
+    # the title is repeated for higher weight
+    keywords = _extract_keywords(chain(
+        (recipe.title, recipe.title), recipe.ingredients, recipe.instructions
+    ))
     
     logger.debug(f"Extracted {len(keywords)} keywords from recipe: {recipe.title}")
     return keywords
@@ -67,13 +61,36 @@ def tokenize_text(text: str) -> List[str]:
     Returns:
         List of tokens
     """
-    # Convert to lowercase and remove special characters
-    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text.lower())
+    # Convert to lowercase and match tokens directly; everything else,
+    # including whitespace and special characters, separates them
+    return _TOKEN_RE.findall(text.lower())
+
+def extract_text_keywords(text: str) -> List[str]:
+    """
+    Extract BM25 keywords from free text.
     
-    # Split on whitespace and filter empty strings
-    tokens = [token.strip() for token in text.split() if token.strip()]
+    Tokens are lowercased alphanumeric runs of at least MIN_KEYWORD_LENGTH
+    characters, matched in a single regex scan, with stopwords removed
+    when enabled.
     
-    return tokens
+    Args:
+        text: Input text
+        
+    Returns:
+        List of keywords in text order
+    """
+    return _extract_keywords((text,))
+
+def _extract_keywords(texts: Iterable[str]) -> List[str]:
+    config = get_vector_config()
+    pattern = _get_keyword_pattern(config.MIN_KEYWORD_LENGTH)
+    tokens = []
+    for text in texts:
+        tokens.extend(pattern.findall(text.lower()))
+    if not config.STOPWORDS_ENABLED:
+        return tokens
+    stopwords = COOKING_STOPWORDS
+    return [token for token in tokens if token not in stopwords]
 
 def extract_query_keywords(query: str) -> List[str]:
     """
@@ -85,17 +102,7 @@ def extract_query_keywords(query: str) -> List[str]:
     Returns:
         List of query keywords
     """
-    config = get_vector_config()
-    
-    # Tokenize query
-    tokens = tokenize_text(query)
-    
-    # Filter keywords
-    keywords = []
-    for token in tokens:
-        if len(token) >= config.MIN_KEYWORD_LENGTH:
-            if not config.STOPWORDS_ENABLED or token.lower() not in COOKING_STOPWORDS:
-                keywords.append(token.lower())
+    keywords = extract_text_keywords(query)
     
     logger.debug(f"Extracted {len(keywords)} keywords from query: '{query}'")
     return keywords
@@ -110,10 +117,10 @@ def build_recipe_corpus(recipes: List[Recipe]) -> List[List[str]]:
     Returns:
         List of tokenized documents (each recipe as list of keywords)
     """
-    corpus = []
-    for recipe in recipes:
-        keywords = extract_recipe_keywords(recipe)
-        corpus.append(keywords)
+    # Kept serial: extraction is a single regex scan per recipe, cheaper
+    # than pickling the recipe to send it to a worker process. Tokens are
+    # interned so repeated words share one string across documents
+    corpus = [list(map(sys.intern, extract_recipe_keywords(recipe))) for recipe in recipes]
     
     logger.info(f"Built BM25 corpus from {len(recipes)} recipes")
     return corpus
\ No newline at end of file
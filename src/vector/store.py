@@ -4,21 +4,72 @@ Provides a high-level interface to Chroma DB operations.
 """
 
 import chromadb
-from typing import List, Optional
-import uuid
+from chromadb.api import ClientAPI
+from chromadb.api.models.Collection import Collection
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import threading
 from datetime import datetime
-from rank_bm25 import BM25Okapi
+import numpy as np
 
 from src.recipes.models import Recipe
 from src.common.config import get_vector_config, get_logger
-from .embeddings import RecipeEmbeddingGenerator, create_search_embedding
-from .keywords import extract_recipe_keywords, extract_query_keywords, build_recipe_corpus
+from .embeddings import RecipeEmbeddingGenerator
+from .bm25 import BM25Index
+from .keywords import extract_recipe_keywords, extract_query_keywords, extract_text_keywords, build_recipe_corpus
 from .filters import RecipeFilter, apply_metadata_filters
-from .types import SearchResult
-from src.common.exceptions import CookingAssistantError, VectorDatabaseError, VectorSearchError, BM25IndexError
+from .types import SearchResult, EmbeddingData, EmbeddingMetadata
+from src.common.exceptions import (
+    CookingAssistantError, EmbeddingGenerationError, PartialWriteError, VectorDatabaseError, VectorSearchError,
+    BM25IndexError
+)
 
 logger = get_logger(__name__)
 
+# Chroma clients and collections shared by every store in the process, so
+# stores opened for the same server (e.g. one per user collection) reuse one
+# HTTP connection pool and skip the heartbeat and collection lookup
+_chroma_clients: Dict[Tuple[str, int], ClientAPI] = {}
+_chroma_collections: Dict[Tuple[str, int, str], Collection] = {}
+_chroma_clients_lock = threading.Lock()
+
+
+def get_chroma_client(host: str, port: int) -> ClientAPI:
+    """
+    Get the shared Chroma client for a server, connecting on first use.
+    
+    Args:
+        host: Chroma DB host
+        port: Chroma DB port
+        
+    Returns:
+        ChromaDB HttpClient instance shared by the whole process
+        
+    Raises:
+        VectorDatabaseError: If connection to ChromaDB fails
+    """
+    with _chroma_clients_lock:
+        client = _chroma_clients.get((host, port))
+        if client is None:
+            try:
+                client = chromadb.HttpClient(host=host, port=port)
+                # Test connection
+                client.heartbeat()
+                logger.debug("Connected to Chroma DB")
+            except Exception as e:
+                raise VectorDatabaseError(f"Failed to connect to Chroma DB at {host}:{port}: {e}") from e
+            _chroma_clients[(host, port)] = client
+    return client
+
+
+def clear_chroma_cache() -> None:
+    """Drop all shared Chroma clients and collections."""
+    with _chroma_clients_lock:
+        _chroma_clients.clear()
+        _chroma_collections.clear()
+
 class VectorStoreError(CookingAssistantError):
     """Exception raised for vector store operations."""
     pass
@@ -29,30 +80,37 @@ class VectorRecipeStore:
     Handles Chroma DB operations with recipe-specific logic.
     """
     
-    def __init__(self, api_key: Optional[str] = None, collection_name: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, collection_name: Optional[str] = None,
+                 embedding_cache_path: Optional[str] = None):
         """
         Initialize the vector recipe store.
         
         Args:
             api_key: OpenAI API key for embedding generation
             collection_name: Name of the collection to use (defaults to config)
+            embedding_cache_path: Optional SQLite file for caching recipe embeddings
         """
         self.config = get_vector_config()
         self.api_key = api_key
         self.collection_name = collection_name or self.config.RECIPE_COLLECTION_NAME
         
         # Initialize embedding generator
-        self.embedding_generator = RecipeEmbeddingGenerator(api_key)
+        self.embedding_generator = RecipeEmbeddingGenerator(api_key, cache_path=embedding_cache_path)
         
-        # Initialize Chroma client
+        # Initialize Chroma client; the collection itself is resolved through
+        # the shared cache on every access, so a clear by any store is seen here
         self._client = None
-        self._collection = None
+        self._collection_key = (self.config.HOST, self.config.PORT, self.collection_name)
         
         # Initialize BM25 index for sparse search
         self._bm25_index = None
         self._bm25_recipes = []  # Store recipes in same order as BM25 corpus
         self._bm25_recipe_ids = []  # Store recipe IDs in same order
         
+        # Recently searched query embeddings, least recently used first
+        self._query_embeddings: OrderedDict[str, List[float]] = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+        
         logger.info(f"Initialized VectorRecipeStore with collection: {self.collection_name}")
     
     @property
@@ -62,7 +120,8 @@ class VectorRecipeStore:
         
         Lazily initializes the HTTP client connection to ChromaDB and tests
         connectivity with a heartbeat. Connection parameters are loaded from
-        the vector configuration.
+        the vector configuration, and the client is shared with every other
+        store connected to the same server.
         
         Returns:
             ChromaDB HttpClient instance
@@ -71,16 +130,7 @@ class VectorRecipeStore:
             VectorDatabaseError: If connection to ChromaDB fails
         """
         if self._client is None:
-            try:
-                self._client = chromadb.HttpClient(
-                    host=self.config.HOST, 
-                    port=self.config.PORT
-                )
-                # Test connection
-                self._client.heartbeat()
-                logger.debug("Connected to Chroma DB")
-            except Exception as e:
-                raise VectorDatabaseError(f"Failed to connect to Chroma DB at {self.config.HOST}:{self.config.PORT}: {e}") from e
+            self._client = get_chroma_client(self.config.HOST, self.config.PORT)
         return self._client
     
     @property 
@@ -88,8 +138,9 @@ class VectorRecipeStore:
         """
         Get or create the recipe collection in ChromaDB.
         
-        Lazily initializes the collection, attempting to get an existing
-        collection first, then creating a new one if it doesn't exist.
+        Looks the collection up in the process-wide cache on every access,
+        attempting to get an existing collection first, then creating a new
+        one if it doesn't exist.
         
         Returns:
             ChromaDB Collection instance for recipe storage
@@ -97,14 +148,15 @@ class VectorRecipeStore:
         Raises:
             VectorDatabaseError: If collection creation or access fails
         """
-        if self._collection is None:
+        collection = _chroma_collections.get(self._collection_key)
+        if collection is None:
             try:
                 # Try to get existing collection
-                self._collection = self.client.get_collection(self.collection_name)
+                collection = self.client.get_collection(self.collection_name)
                 logger.debug(f"Connected to existing collection: {self.collection_name}")
             except ValueError:
                 # Create new collection if it doesn't exist (Chroma raises ValueError for missing collections)
-                self._collection = self.client.create_collection(
+                collection = self.client.create_collection(
                     name=self.collection_name,
                     metadata={
                         "description": "Recipe collection for semantic search",
@@ -112,7 +164,8 @@ class VectorRecipeStore:
                     }
                 )
                 logger.info(f"Created new collection: {self.collection_name}")
-        return self._collection
+            _chroma_collections[self._collection_key] = collection
+        return collection
     
     def add_recipe(self, recipe: Recipe, recipe_id: Optional[str] = None) -> str:
         """
@@ -120,128 +173,218 @@ class VectorRecipeStore:
         
         Args:
             recipe: Recipe object to add
-            recipe_id: Optional custom ID (generates UUID if not provided)
+            recipe_id: Optional custom ID (generates a random ID if not provided)
             
         Returns:
             ID of the added recipe
+            
+        Raises:
+            VectorDatabaseError: If the recipe cannot be embedded or written
         """
-        if recipe_id is None:
-            recipe_id = f"recipe_{uuid.uuid4().hex[:8]}"
-        
-        logger.info(f"Adding recipe '{recipe.title}' with ID: {recipe_id}")
-        
+        # Single adds share the batch path, including its embedding cache
         try:
-            # Generate embedding
-            embedding_data = self.embedding_generator.generate_recipe_embedding(recipe)
-            
-            # Add to collection
-            self.collection.add(
-                embeddings=[embedding_data["embedding"]],
-                documents=[embedding_data["text"]],
-                metadatas=[embedding_data["metadata"]],
-                ids=[recipe_id]
-            )
-            
-            logger.info(f"Successfully added recipe '{recipe.title}' to vector store")
-            return recipe_id
-            
+            return self.add_recipes([recipe], [recipe_id] if recipe_id is not None else None)[0]
         except Exception as e:
             raise VectorDatabaseError(f"Failed to add recipe '{recipe.title}': {e}") from e
     
-    def add_recipes(self, recipes: List[Recipe], recipe_ids: Optional[List[str]] = None) -> List[str]:
+    def add_recipes(self, recipes: List[Recipe], recipe_ids: Optional[List[str]] = None,
+                    extra_metadata: Optional[Dict[str, Any]] = None) -> List[str]:
         """
         Add multiple recipes to the vector store.
         
         Args:
             recipes: List of Recipe objects to add
             recipe_ids: Optional list of custom IDs
+            extra_metadata: Optional fields added to every recipe's metadata
             
         Returns:
             List of IDs for added recipes
+            
+        Raises:
+            EmbeddingGenerationError: If no recipe could be embedded
+            PartialWriteError: If a chunk fails after earlier chunks were
+                written; carries the IDs that were added
+            VectorDatabaseError: If writing to Chroma DB fails
         """
         if recipe_ids is None:
-            recipe_ids = [f"recipe_{uuid.uuid4().hex[:8]}" for _ in recipes]
+            # Random 8-hex-digit IDs, drawn with one urandom call for the
+            # whole batch instead of a uuid4 per recipe
+            random_hex = os.urandom(4 * len(recipes)).hex()
+            recipe_ids = [f"recipe_{random_hex[i:i + 8]}" for i in range(0, len(random_hex), 8)]
         
         if len(recipe_ids) != len(recipes):
             raise VectorStoreError("Number of recipe IDs must match number of recipes")
         
         logger.info(f"Adding {len(recipes)} recipes to vector store")
         
+        # Chunks are sized to fill every concurrent embedding request; each
+        # embedded chunk is written to Chroma on a background thread while
+        # the next one is being embedded
+        chunk_size = self.config.EMBEDDING_BATCH_SIZE * self.config.MAX_CONCURRENT_BATCHES
+        if len(recipes) <= chunk_size:
+            chunks = [(recipes, recipe_ids)]
+        else:
+            chunks = [
+                (recipes[start:start + chunk_size], recipe_ids[start:start + chunk_size])
+                for start in range(0, len(recipes), chunk_size)
+            ]
+        
+        writes = []
+        error = None
         try:
-            # Generate embeddings for all recipes
-            embedding_results = self.embedding_generator.generate_batch_embeddings(recipes)
-            
-            if not embedding_results:
-                raise VectorStoreError("No embeddings were generated")
-            
-            # Prepare data for batch insert
-            embeddings = [result["embedding"] for result in embedding_results]
-            documents = [result["text"] for result in embedding_results]
-            metadatas = [result["metadata"] for result in embedding_results]
-            
-            # Use only the IDs for recipes that were successfully embedded
-            used_ids = recipe_ids[:len(embedding_results)]
+            collection = self.collection
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                for chunk, chunk_ids in chunks:
+                    embedding_results = self.embedding_generator.generate_batch_embeddings(chunk)
+                    if not embedding_results:
+                        continue
+                    
+                    used_ids = self._embedded_recipe_ids(chunk, chunk_ids, embedding_results)
+                    if extra_metadata:
+                        metadatas = [{**result["metadata"], **extra_metadata} for result in embedding_results]
+                    else:
+                        metadatas = [result["metadata"] for result in embedding_results]
+                    writes.append((used_ids, writer.submit(
+                        collection.add,
+                        embeddings=[result["embedding"] for result in embedding_results],
+                        documents=[result["text"] for result in embedding_results],
+                        metadatas=metadatas,
+                        ids=used_ids
+                    )))
+        except Exception as e:
+            # Chunks submitted before the failure are still written
+            error = e
+        
+        written = []
+        for used_ids, write in writes:
+            try:
+                write.result()
+                written.append(used_ids)
+            except Exception as e:
+                error = error or e
+        
+        if error is not None:
+            added_ids = [recipe_id for used_ids in written for recipe_id in used_ids]
+            if added_ids:
+                raise PartialWriteError(
+                    f"Failed to add recipes after adding {len(added_ids)}: {error}", added_ids
+                ) from error
+            if isinstance(error, EmbeddingGenerationError):
+                raise error
+            raise VectorDatabaseError(f"Failed to add recipes: {error}") from error
+        
+        if not writes:
+            raise EmbeddingGenerationError("No embeddings were generated")
+        
+        added_ids = writes[0][0] if len(writes) == 1 else [
+            recipe_id for used_ids, _ in writes for recipe_id in used_ids
+        ]
+        logger.info(f"Successfully added {len(added_ids)} recipes to vector store")
+        return added_ids
+    
+    @staticmethod
+    def _embedded_recipe_ids(recipes: List[Recipe], recipe_ids: List[str],
+                             embedding_results: List[EmbeddingData]) -> List[str]:
+        # Use only the IDs for recipes that were successfully embedded,
+        # avoiding a copy of the ID list when every recipe was embedded.
+        # Failed recipes are skipped anywhere in the batch, so each result
+        # is paired with the ID of the recipe it came from, in input order
+        if len(embedding_results) == len(recipe_ids):
+            return recipe_ids
+        remaining = iter(zip(recipes, recipe_ids))
+        return [
+            next(recipe_id for recipe, recipe_id in remaining if recipe is result["recipe"])
+            for result in embedding_results
+        ]
+    
+    def add_embeddings(self, recipe_ids: List[str], embeddings: List[List[float]],
+                       documents: List[str], metadatas: List[EmbeddingMetadata]) -> List[str]:
+        """
+        Add recipes whose embeddings were generated outside the store.
+        
+        Args:
+            recipe_ids: IDs for the recipes
+            embeddings: Precomputed embedding vectors
+            documents: Recipe texts the embeddings were generated from
+            metadatas: Metadata for each recipe
             
-            # Add to collection
+        Returns:
+            List of IDs for added recipes
+        """
+        if not (len(recipe_ids) == len(embeddings) == len(documents) == len(metadatas)):
+            raise VectorStoreError("Number of IDs, embeddings, documents and metadatas must match")
+        
+        logger.info(f"Adding {len(recipe_ids)} precomputed embeddings to vector store")
+        
+        try:
             self.collection.add(
                 embeddings=embeddings,
                 documents=documents,
                 metadatas=metadatas,
-                ids=used_ids
+                ids=recipe_ids
             )
-            
-            logger.info(f"Successfully added {len(embedding_results)} recipes to vector store")
-            return used_ids
+            return recipe_ids
             
         except Exception as e:
-            raise VectorDatabaseError(f"Failed to add recipes: {e}") from e
+            raise VectorDatabaseError(f"Failed to add precomputed embeddings: {e}") from e
     
     def _build_bm25_index(self) -> None:
         """
         Build BM25 sparse search index from all recipes in the collection.
         
-        Retrieves all recipes from ChromaDB, extracts keywords from titles,
-        ingredients, and instructions, then builds a BM25Okapi index for 
-        keyword-based sparse search.
+        Retrieves all recipes from ChromaDB and builds a BM25Index for
+        keyword-based sparse search. Keywords stored in recipe metadata at
+        ingestion are used as-is; older recipes without them have keywords
+        extracted from their title, ingredients, and instructions.
         
         Raises:
             BM25IndexError: If index building fails
         """
         try:
-            # Get all recipes from collection
-            all_data = self.collection.get()
+            # Get all recipe metadata from collection
+            all_data = self.collection.get(include=['metadatas'])
             
             if not all_data or not all_data.get('metadatas'):
                 logger.warning("No recipes found in collection for BM25 indexing")
                 return
             
-            # Build keyword corpus directly from metadata without creating Recipe objects
+            # Build keyword corpus directly from metadata without creating Recipe objects.
+            # The index encodes tokens to integer IDs, so the word lists are only
+            # kept until it is built
             corpus = []
             recipe_metadata = []
             recipe_ids = []
             
             for i, metadata in enumerate(all_data['metadatas']):
                 try:
+                    # Recipes ingested with precomputed keywords need no tokenizing
+                    stored_keywords = metadata.get('keywords')
+                    if stored_keywords:
+                        corpus.append(stored_keywords.split())
+                        recipe_metadata.append(metadata)
+                        recipe_ids.append(all_data['ids'][i])
+                        continue
+                    
                     # Extract text content for BM25 indexing
                     title = metadata.get('title', 'Unknown')
                     
                     # Handle ingredients - might be stored as string or list
                     ingredients = metadata.get('ingredients', [])
                     if isinstance(ingredients, str):
-                        ingredients = [ing.strip() for ing in ingredients.replace('\n', ',').split(',') if ing.strip()]
+                        ingredients = list(filter(None, map(str.strip, ingredients.replace('\n', ',').split(','))))
                     elif not isinstance(ingredients, list):
                         ingredients = []
                     
                     # Handle instructions - might be stored as string or list  
                     instructions = metadata.get('instructions', [])
                     if isinstance(instructions, str):
-                        instructions = [inst.strip() for inst in instructions.split('\n') if inst.strip()]
+                        instructions = list(filter(None, map(str.strip, instructions.split('\n'))))
                     elif not isinstance(instructions, list):
                         instructions = []
                     
                     # Skip recipes with no meaningful content
                     if not title or title == 'Unknown':
-                        logger.debug(f"Skipping recipe with no title - insufficient data for BM25 indexing")
+                        logger.debug("Skipping recipe with no title - insufficient data for BM25 indexing")
                         continue
                     
                     # Build keyword list for this recipe (similar to extract_recipe_keywords)
@@ -252,24 +395,11 @@ class VectorRecipeStore:
                     text_content.extend(ingredients)
                     text_content.extend(instructions)
                     
-                    # Join and tokenize
-                    full_text = ' '.join(text_content)
-                    from .keywords import tokenize_text
-                    from src.common.config import get_vector_config
-                    
-                    config = get_vector_config()
-                    tokens = tokenize_text(full_text)
-                    
-                    # Filter keywords
-                    from .keywords import COOKING_STOPWORDS
-                    keywords = []
-                    for token in tokens:
-                        if len(token) >= config.MIN_KEYWORD_LENGTH:
-                            if not config.STOPWORDS_ENABLED or token.lower() not in COOKING_STOPWORDS:
-                                keywords.append(token.lower())
+                    # Join and extract keywords
+                    keywords = extract_text_keywords(' '.join(text_content))
                     
                     if not keywords:
-                        logger.debug(f"Skipping recipe '{title}' - no keywords extracted")
+                        logger.debug("Skipping recipe '%s' - no keywords extracted", title)
                         continue
                     
                     corpus.append(keywords)
@@ -285,7 +415,7 @@ class VectorRecipeStore:
                 return
             
             # Create BM25 index from corpus
-            self._bm25_index = BM25Okapi(
+            self._bm25_index = BM25Index(
                 corpus,
                 k1=self.config.BM25_K1,
                 b=self.config.BM25_B
@@ -355,24 +485,23 @@ class VectorRecipeStore:
             # Get top N results with scores
             top_indices = scores.argsort()[-n_results:][::-1]  # Descending order
             
-            results = []
-            for idx in top_indices:
-                if scores[idx] > 0:  # Only include results with positive scores
-                    recipe_metadata = self._bm25_recipes[idx]
-                    recipe_id = self._bm25_recipe_ids[idx]
-                    
-                    results.append({
-                        'recipe': recipe_metadata,  # Now contains metadata dict instead of Recipe object
-                        'recipe_id': recipe_id,
-                        'score': float(scores[idx]),
-                        'search_type': 'sparse'
-                    })
+            # Only include results with positive scores
+            results = [
+                {
+                    'recipe': self._bm25_recipes[idx],  # Now contains metadata dict instead of Recipe object
+                    'recipe_id': self._bm25_recipe_ids[idx],
+                    'score': float(scores[idx]),
+                    'search_type': 'sparse'
+                }
+                for idx in top_indices
+                if scores[idx] > 0
+            ]
             
             # Apply filters if provided
             if filters and filters.has_filters():
                 results = apply_metadata_filters(results, filters)
             
-            logger.info(f"Sparse search for '{query}' returned {len(results)} results")
+            logger.info("Sparse search for '%s' returned %d results", query, len(results))
             return results
             
         except BM25IndexError as e:
@@ -477,28 +606,33 @@ class VectorRecipeStore:
         sparse_weight = sparse_weight if sparse_weight is not None else self.config.HYBRID_SPARSE_WEIGHT
         dense_weight = dense_weight if dense_weight is not None else self.config.HYBRID_DENSE_WEIGHT
         
-        logger.info(f"Hybrid search for: '{query}' (sparse_weight: {sparse_weight}, dense_weight: {dense_weight})")
+        logger.info("Hybrid search for: '%s' (sparse_weight: %s, dense_weight: %s)", query, sparse_weight, dense_weight)
         
         try:
             # Perform both searches - get more results initially for better RRF combination
             search_limit = min(n_results * 2, 20)  # Get up to 20 results from each method
             
-            # Try sparse search first
-            try:
-                sparse_results = self.search_recipes_sparse(query, n_results=search_limit, filters=filters)
-            except Exception as e:
-                logger.warning(f"Sparse search failed in hybrid mode: {e}, continuing with dense only")
-                sparse_results = []
-            
-            # Try dense search
-            try:
-                dense_results = self.search_recipes(query, n_results=search_limit, filters=filters)
-            except Exception as e:
-                logger.warning(f"Dense search failed in hybrid mode: {e}, continuing with sparse only")
-                dense_results = []
+            # The dense leg waits on the embeddings API and Chroma, so it runs
+            # on a background thread while the sparse leg scores on this one
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                dense_future = executor.submit(self.search_recipes, query, n_results=search_limit, filters=filters)
+                
+                # Try sparse search
+                try:
+                    sparse_results = self.search_recipes_sparse(query, n_results=search_limit, filters=filters)
+                except Exception as e:
+                    logger.warning(f"Sparse search failed in hybrid mode: {e}, continuing with dense only")
+                    sparse_results = []
+                
+                # Try dense search
+                try:
+                    dense_results = dense_future.result()
+                except Exception as e:
+                    logger.warning(f"Dense search failed in hybrid mode: {e}, continuing with sparse only")
+                    dense_results = []
             
-            logger.debug(f"Sparse search returned {len(sparse_results)} results")
-            logger.debug(f"Dense search returned {len(dense_results)} results")
+            logger.debug("Sparse search returned %d results", len(sparse_results))
+            logger.debug("Dense search returned %d results", len(dense_results))
             
             # If both methods failed, fall back to individual methods
             if not sparse_results and not dense_results:
@@ -512,7 +646,7 @@ class VectorRecipeStore:
                 n_results
             )
             
-            logger.info(f"Hybrid search for '{query}' returned {len(combined_results)} combined results")
+            logger.info("Hybrid search for '%s' returned %d combined results", query, len(combined_results))
             return combined_results
             
         except Exception as e:
@@ -525,6 +659,23 @@ class VectorRecipeStore:
                 logger.error(f"Fallback dense search also failed: {fallback_error}")
                 return []
     
+    def _embed_query(self, query: str) -> List[float]:
+        # Repeated searches reuse the query's embedding instead of another
+        # API request; the cache is bounded by QUERY_EMBEDDING_CACHE_SIZE
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(query)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(query)
+                return embedding
+        
+        embedding = self.embedding_generator.generate_embedding(query)
+        
+        with self._query_embeddings_lock:
+            self._query_embeddings[query] = embedding
+            while len(self._query_embeddings) > self.config.QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding
+    
     def search_recipes(self, query: str, n_results: Optional[int] = None, 
                       min_similarity: Optional[float] = None,
                       filters: Optional[RecipeFilter] = None) -> List[SearchResult]:
@@ -543,41 +694,40 @@ class VectorRecipeStore:
         n_results = n_results or self.config.DEFAULT_SEARCH_LIMIT
         min_similarity = min_similarity or (1 - self.config.SIMILARITY_THRESHOLD)
         
-        logger.info(f"Searching recipes for: '{query}' (limit: {n_results})")
+        logger.info("Searching recipes for: '%s' (limit: %d)", query, n_results)
         
         try:
-            # Generate embedding for search query
-            query_embedding = create_search_embedding(query, self.api_key)
+            # Generate embedding for search query, reusing the store's client
+            query_embedding = self._embed_query(query)
             
-            # Search in collection
+            # Search in collection. The difficulty filter is an exact match on
+            # a stored string, so Chroma can apply it before ranking; the
+            # remaining filters are applied to the returned results below
             results = self.collection.query(
                 query_embeddings=[query_embedding],
-                n_results=n_results
+                n_results=n_results,
+                where={'difficulty': filters.difficulty} if filters and filters.difficulty else None
             )
             
-            # Process results
-            search_results = []
-            for i in range(len(results['ids'][0])):
-                distance = results['distances'][0][i]
-                similarity = 1 - distance
-                
-                # Filter by minimum similarity
-                if similarity < min_similarity:
-                    continue
-                
-                result = {
-                    'id': results['ids'][0][i],
-                    'similarity': similarity,
-                    'metadata': results['metadatas'][0][i],
-                    'document': results['documents'][0][i]
+            # Process results, converting distances and dropping those below
+            # the minimum similarity in one vectorized step
+            ids, metadatas, documents = results['ids'][0], results['metadatas'][0], results['documents'][0]
+            similarities = 1.0 - np.asarray(results['distances'][0], dtype=float)
+            search_results = [
+                {
+                    'id': ids[i],
+                    'similarity': float(similarities[i]),
+                    'metadata': metadatas[i],
+                    'document': documents[i]
                 }
-                search_results.append(result)
+                for i in np.flatnonzero(similarities >= min_similarity)
+            ]
             
             # Apply filters if provided
             if filters and filters.has_filters():
                 search_results = apply_metadata_filters(search_results, filters)
             
-            logger.info(f"Found {len(search_results)} recipes matching '{query}'")
+            logger.info("Found %d recipes matching '%s'", len(search_results), query)
             return search_results
             
         except Exception as e:
@@ -623,8 +773,11 @@ class VectorRecipeStore:
         logger.info(f"Updating recipe {recipe_id}: {recipe.title}")
         
         try:
-            # Generate new embedding
-            embedding_data = self.embedding_generator.generate_recipe_embedding(recipe)
+            # Generate new embedding through the batch path, including its embedding cache
+            embedding_results = self.embedding_generator.generate_batch_embeddings([recipe])
+            if not embedding_results:
+                raise VectorStoreError("No embedding was generated")
+            embedding_data = embedding_results[0]
             
             # Update in collection
             self.collection.update(
@@ -662,6 +815,30 @@ class VectorRecipeStore:
             logger.error(f"Failed to delete recipe {recipe_id}: {e}")
             return False
     
+    def delete_recipes(self, recipe_ids: List[str]) -> bool:
+        """
+        Delete several recipes from the vector store in one request.
+        
+        Args:
+            recipe_ids: IDs of recipes to delete
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not recipe_ids:
+            return True
+        
+        logger.info(f"Deleting {len(recipe_ids)} recipes")
+        
+        try:
+            self.collection.delete(ids=recipe_ids)
+            logger.info(f"Successfully deleted {len(recipe_ids)} recipes")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to delete recipes: {e}")
+            return False
+    
     def count_recipes(self) -> int:
         """Get total number of recipes in the store."""
         try:
@@ -683,7 +860,12 @@ class VectorRecipeStore:
         try:
             # Delete the collection and recreate it
             self.client.delete_collection(self.collection_name)
-            self._collection = None  # Reset cached collection
+            # Every store for this collection re-resolves it on next access
+            _chroma_collections.pop(self._collection_key, None)
+            
+            # Lazy import to avoid a circular dependency with user collections
+            from .user_collections import forget_user_recipe_count
+            forget_user_recipe_count(*self._collection_key)
             
             # Recreate collection (will happen on next access)
             _ = self.collection
@@ -3,7 +3,9 @@ Type definitions for vector database operations.
 Centralized location for all vector-related type definitions.
 """
 
-from typing import List, Dict, Optional, Union, TypedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Dict, Optional, Union, TypedDict
 from src.recipes.models import Recipe
 
 # Recipe metadata structure
@@ -15,8 +17,23 @@ SearchResult = Dict[str, Union[str, float, RecipeMetadata]]
 # Filter dictionary structure
 FilterDict = Dict[str, Optional[Union[str, List[str]]]]
 
-# Ingestion statistics structure
-IngestionStats = Dict[str, Union[str, int, List[str], bool]]
+@dataclass(slots=True)
+class IngestionStats:
+    """Running counters for a recipe ingestion run."""
+    processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    duration: float = 0.0
+
+class IngestionResult(TypedDict, total=False):
+    """Outcome of an ingestion run; error is only set on failure."""
+    status: str
+    stats: Dict[str, Any]
+    recipe_ids: List[str]
+    error: str
+    verification: Dict[str, Any]
 
 # Embedding-specific types
 class EmbeddingMetadata(TypedDict):
@@ -29,6 +46,7 @@ class EmbeddingMetadata(TypedDict):
     servings: int
     ingredient_count: int
     instruction_count: int
+    keywords: str  # Space-joined BM25 keywords, extracted once at ingestion
 
 class EmbeddingData(TypedDict):
     """Structure for recipe embedding data."""
@@ -3,8 +3,13 @@ User recipe collections management for the vector database.
 Provides functionality for user-specific recipe storage, validation, and retrieval.
 """
 
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from chromadb.errors import NotFoundError
 
 from src.recipes.models import Recipe
@@ -15,15 +20,69 @@ from .store import VectorRecipeStore
 
 logger = get_logger(__name__)
 
+# User IDs made only of characters that are valid in collection names
+_SAFE_USER_ID_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+# Any alphanumeric character, as defined by str.isalnum() (word characters
+# other than the underscore)
+_HAS_ALNUM = re.compile(r'[^\W_]').search
+
+# Characters that are neither alphanumeric nor '-' or '_'
+_UNSAFE_USER_ID_CHAR_RE = re.compile(r'[^\w-]')
+
+# Recipe counts read from Chroma DB and shared by every UserRecipeCollection
+# for the same user. Keys are (Chroma host, Chroma port, collection name), the
+# same key the vector store uses for its shared collection cache
+_recipe_counts: Dict[Tuple[str, int, str], int] = {}
+_recipe_counts_lock = threading.Lock()
+
 
 class UserRecipeCollectionError(VectorDatabaseError):
     """Exception raised for user recipe collection operations."""
     pass
 
 
+@lru_cache(maxsize=4096)
+def _check_user_id(user_id: str, max_length: int) -> str:
+    """
+    Check and sanitize a non-empty user ID string.
+    
+    Memoized because the same user IDs recur across many collections;
+    the maximum length is part of the key so config changes take effect.
+    """
+    if len(user_id) > max_length:
+        raise UserRecipeCollectionError(f"User ID too long (max {max_length} chars)")
+        
+    # Check that user ID contains at least one alphanumeric character
+    if not _HAS_ALNUM(user_id):
+        raise UserRecipeCollectionError("User ID must contain at least one alphanumeric character")
+        
+    # Most user IDs are already safe and need no sanitizing
+    if _SAFE_USER_ID_RE.fullmatch(user_id):
+        return user_id
+        
+    # Sanitize user ID for collection name (replace invalid chars)
+    return _UNSAFE_USER_ID_CHAR_RE.sub("_", user_id)
+
+
+def clear_user_recipe_counts() -> None:
+    """Forget all shared user recipe counts."""
+    with _recipe_counts_lock:
+        _recipe_counts.clear()
+
+
+def forget_user_recipe_count(host: str, port: int, collection_name: str) -> None:
+    """Forget the shared recipe count of one collection, e.g. after it is cleared."""
+    with _recipe_counts_lock:
+        _recipe_counts.pop((host, port, collection_name), None)
+
+
 class UserRecipeCollection:
     """Manages user-specific recipe collections in the vector database."""
     
+    # One instance is held per active user, so skip the per-instance __dict__
+    __slots__ = ('config', 'user_id', 'collection_name', '_api_key', '_store', '_count_key')
+    
     def __init__(self, user_id: str, api_key: Optional[str] = None):
         """Initialize user recipe collection.
         
@@ -35,23 +94,28 @@ class UserRecipeCollection:
         self.user_id = self._validate_user_id(user_id)
         self.collection_name = f"{self.config.USER_COLLECTION_PREFIX}{self.user_id}"
         
-        # Initialize the underlying vector store with user's collection
-        self.store = VectorRecipeStore(api_key=api_key, collection_name=self.collection_name)
+        # The underlying vector store is created on first use
+        self._api_key = api_key
+        self._store = None
+        self._count_key: Tuple[str, int, str] = (self.config.HOST, self.config.PORT, self.collection_name)
+    
+    @property
+    def store(self) -> VectorRecipeStore:
+        """Vector store for the user's collection, created on first access.
+        
+        Creating the store sets up an OpenAI client, which callers that only
+        validate the user ID or read a cached count never need.
+        """
+        if self._store is None:
+            self._store = VectorRecipeStore(api_key=self._api_key, collection_name=self.collection_name)
+        return self._store
     
     def _validate_user_id(self, user_id: str) -> str:
         """Validate and sanitize user ID."""
         if not user_id or not isinstance(user_id, str):
             raise UserRecipeCollectionError("User ID must be a non-empty string")
         
-        if len(user_id) > self.config.USER_ID_MAX_LENGTH:
-            raise UserRecipeCollectionError(f"User ID too long (max {self.config.USER_ID_MAX_LENGTH} chars)")
-            
-        # Check that user ID contains at least one alphanumeric character
-        if not any(c.isalnum() for c in user_id):
-            raise UserRecipeCollectionError("User ID must contain at least one alphanumeric character")
-            
-        # Sanitize user ID for collection name (replace invalid chars)
-        return "".join(c if c.isalnum() or c in "-_" else "_" for c in user_id)
+        return _check_user_id(user_id, self.config.USER_ID_MAX_LENGTH)
     
     def add_user_recipe(self, recipe: Recipe) -> str:
         """Add a user-uploaded recipe to their collection.
@@ -62,69 +126,173 @@ class UserRecipeCollection:
         Returns:
             Recipe ID in the collection
         """
+        return self.add_user_recipes([recipe])[0]
+    
+    def add_user_recipes(self, recipes: List[Recipe]) -> List[str]:
+        """Add several user-uploaded recipes to their collection at once.
+        
+        The recipes are embedded in batched API requests and written to the
+        collection in batched adds rather than one round trip per recipe.
+        
+        Args:
+            recipes: Recipe objects to add
+            
+        Returns:
+            Recipe IDs in the collection
+        """
+        if not recipes:
+            return []
+        
         try:
-            # Check user recipe count limit
-            current_count = self.get_user_recipe_count() 
-            if current_count >= self.config.MAX_USER_RECIPES:
+            # Check user recipe count limit once for the whole upload
+            current_count = self.get_user_recipe_count()
+            if current_count + len(recipes) > self.config.MAX_USER_RECIPES:
                 raise UserRecipeCollectionError(
                     f"User recipe limit exceeded ({self.config.MAX_USER_RECIPES})"
                 )
             
-            # Create user recipe metadata
-            user_recipe_metadata = {
-                "title": recipe.title,
-                "difficulty": recipe.difficulty,
-                "prep_time": recipe.prep_time,
-                "cook_time": recipe.cook_time,
-                "servings": recipe.servings,
+            # User fields stored alongside each recipe's standard metadata
+            user_metadata = {
                 "user_id": self.user_id,
                 "uploaded_at": datetime.utcnow().isoformat()
             }
             
-            # Store recipe in user's collection
-            return self.store.insert_recipe(recipe, metadata=user_recipe_metadata)
+            # Store recipes in user's collection
+            recipe_ids = self.store.add_recipes(recipes, extra_metadata=user_metadata)
+            with _recipe_counts_lock:
+                if self._count_key in _recipe_counts:
+                    _recipe_counts[self._count_key] += len(recipe_ids)
+            return recipe_ids
             
         except Exception as e:
             if isinstance(e, UserRecipeCollectionError):
                 raise
-            raise UserRecipeCollectionError(f"Failed to add user recipe: {str(e)}") from e
+            # A failed add may have written some chunks
+            self.invalidate_count()
+            raise UserRecipeCollectionError(f"Failed to add user recipes: {str(e)}") from e
+    
+    def get_user_recipes(self, limit: Optional[int] = None,
+                         include_documents: bool = True) -> List[Dict[str, Any]]:
+        """Retrieve all recipes from user's collection.
+        
+        List views that only show metadata can pass include_documents=False
+        to skip transferring the full recipe text; 'document' is then empty.
+        """
+        columns = self.get_user_recipes_columnar(limit, include_documents)
+        return self._recipe_rows(columns['ids'], columns['documents'], columns['metadatas'])
     
-    def get_user_recipes(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Retrieve all recipes from user's collection."""
+    def iter_user_recipes(self, page_size: Optional[int] = None,
+                          include_documents: bool = True, prefetch: bool = False) -> Iterator[Dict[str, Any]]:
+        """Iterate over every recipe in user's collection, one page at a time.
+        
+        Only one page of documents and metadata is held in memory at once,
+        however large the collection is (two when prefetching).
+        
+        Args:
+            page_size: Recipes fetched per request (defaults to USER_RECIPE_PAGE_SIZE)
+            include_documents: Whether to fetch recipe documents as well as metadata
+            prefetch: Fetch the next page on a background thread while the
+                caller consumes the current one
+            
+        Yields:
+            Recipe dictionaries in the same format as get_user_recipes
+        """
+        page_size = page_size or self.config.USER_RECIPE_PAGE_SIZE
+        include = self._get_include(include_documents)
+        
+        def fetch_page(offset: int) -> Dict[str, Any]:
+            try:
+                return self.store.collection.get(limit=page_size, offset=offset, include=include)
+            except Exception as e:
+                raise UserRecipeCollectionError(f"Failed to retrieve user recipes: {str(e)}") from e
+        
+        with (ThreadPoolExecutor(max_workers=1) if prefetch else nullcontext()) as executor:
+            offset = 0
+            next_page = executor.submit(fetch_page, offset) if prefetch else None
+            while True:
+                results = next_page.result() if prefetch else fetch_page(offset)
+                ids = results['ids']
+                is_last = len(ids) < page_size
+                offset += page_size
+                if prefetch and not is_last:
+                    next_page = executor.submit(fetch_page, offset)
+                
+                yield from self._recipe_rows(ids, results.get('documents'), results['metadatas'])
+                if is_last:
+                    return
+    
+    @staticmethod
+    def _get_include(include_documents: bool) -> List[str]:
+        # Documents hold the full recipe text and dominate the response size
+        return ['metadatas', 'documents'] if include_documents else ['metadatas']
+    
+    def _recipe_rows(self, ids: List[str], documents: Optional[List[str]],
+                     metadatas: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'id': doc_id,
+                'document': document,
+                'metadata': metadata,
+                'user_id': self.user_id
+            }
+            for doc_id, document, metadata in zip(
+                ids, documents or [""] * len(ids), metadatas or [{} for _ in ids]
+            )
+        ]
+    
+    def get_user_recipes_columnar(self, limit: Optional[int] = None,
+                                  include_documents: bool = True) -> Dict[str, Any]:
+        """Retrieve recipes from user's collection as parallel lists.
+        
+        Returns Chroma DB's columns as-is, without building a dict per recipe.
+        
+        Args:
+            limit: Maximum number of recipes (defaults to DEFAULT_SEARCH_LIMIT)
+            include_documents: Whether to fetch recipe documents as well as metadata
+            
+        Returns:
+            Dictionary with 'ids', 'documents' and 'metadatas' lists and the 'user_id';
+            'documents' is None when not included
+        """
         try:
             search_limit = limit or self.config.DEFAULT_SEARCH_LIMIT
             
             # Get all recipes from user collection using the public collection property
-            results = self.store.collection.get(limit=search_limit)
-            
-            user_recipes = []
-            for i, doc_id in enumerate(results['ids']):
-                try:
-                    metadata = results['metadatas'][i] if results['metadatas'] else {}
-                    document = results['documents'][i] if results['documents'] else ""
-                    
-                    user_recipe = {
-                        'id': doc_id,
-                        'document': document,
-                        'metadata': metadata,
-                        'user_id': self.user_id
-                    }
-                    user_recipes.append(user_recipe)
-                    
-                except (IndexError, KeyError):
-                    continue
-            
-            return user_recipes
+            results = self.store.collection.get(limit=search_limit, include=self._get_include(include_documents))
+            return {
+                'ids': results['ids'],
+                'documents': results.get('documents'),
+                'metadatas': results['metadatas'],
+                'user_id': self.user_id
+            }
             
         except Exception as e:
             raise UserRecipeCollectionError(f"Failed to retrieve user recipes: {str(e)}") from e
     
     def get_user_recipe_count(self) -> int:
-        """Get the total number of recipes in user's collection."""
+        """Get the total number of recipes in user's collection.
+        
+        The count is read from Chroma DB once and then kept current by this
+        process's adds, so limit checks before uploads need no round trip.
+        """
+        with _recipe_counts_lock:
+            count = _recipe_counts.get(self._count_key)
+        if count is not None:
+            return count
+        
         try:
-            return self.store.count_recipes()
-        except Exception:
+            count = self.store.collection.count()
+        except Exception as e:
+            logger.error(f"Failed to count user recipes: {e}")
             return 0
+        
+        with _recipe_counts_lock:
+            _recipe_counts[self._count_key] = count
+        return count
+    
+    def invalidate_count(self) -> None:
+        """Forget the cached recipe count so the next read asks Chroma DB."""
+        forget_user_recipe_count(*self._count_key)
     
     def search_user_recipes(self, query: str, n_results: Optional[int] = None, 
                            search_type: str = "hybrid") -> List[SearchResult]:
@@ -145,11 +313,22 @@ class UserRecipeCollection:
     
     def delete_user_recipe(self, recipe_id: str) -> bool:
         """Delete a recipe from user's collection."""
+        return self.delete_user_recipes([recipe_id])
+    
+    def delete_user_recipes(self, recipe_ids: List[str]) -> bool:
+        """Delete several recipes from user's collection in one request."""
+        if not recipe_ids:
+            return True
+        
+        # Name a single recipe, but only count larger batches
+        described = f"recipe {recipe_ids[0]}" if len(recipe_ids) == 1 else f"{len(recipe_ids)} recipes"
         try:
-            success = self.store.delete_recipe(recipe_id)
+            success = self.store.delete_recipes(recipe_ids)
+            # Chroma DB ignores unknown IDs, so the count is re-read rather
+            # than decremented
+            self.invalidate_count()
             if not success:
-                raise UserRecipeCollectionError(f"Failed to delete recipe {recipe_id}")
+                raise UserRecipeCollectionError(f"Failed to delete {described}")
             return True
         except Exception as e:
-            raise UserRecipeCollectionError(f"Failed to delete recipe {recipe_id}: {str(e)}") from e
-    
+            raise UserRecipeCollectionError(f"Failed to delete {described}: {str(e)}") from e
@@ -47,6 +47,11 @@ class TestExamples(unittest.TestCase):
         recipe_count = examples.count("Example Recipe:")
         self.assertEqual(recipe_count, 15)
 
+    def test_get_few_shot_examples_cached(self):
+        """Test that repeated requests for the same count reuse the formatted text"""
+        self.assertIs(get_few_shot_examples(3), get_few_shot_examples(3))
+        self.assertEqual(get_few_shot_examples(1).count("Example Recipe:"), 1)
+
     def test_get_few_shot_examples_zero_count(self):
         """Test getting zero examples"""
         examples = get_few_shot_examples(0)
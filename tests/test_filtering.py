@@ -88,6 +88,22 @@ class TestApplyMetadataFilters(unittest.TestCase):
         result = apply_metadata_filters(self.sample_results, filter_obj)
         self.assertEqual(len(result), 1)  # Only recipe1 matches both
 
+    
+    def test_missing_and_invalid_numeric_values(self):
+        """Test that missing values pass range filters, numeric strings are parsed and unparseable ones never pass."""
+        results = self.sample_results + [
+            {'id': 'no_prep', 'metadata': {'title': 'Salad', 'difficulty': 'Beginner', 'cook_time': 5}},
+            {'id': 'bad_prep', 'metadata': {'title': 'Soup', 'difficulty': 'Beginner', 'prep_time': 'ten'}},
+            {'id': 'legacy_prep', 'metadata': {'title': 'Stew', 'difficulty': 'Beginner', 'prep_time': '15'}},
+            {'id': 'empty', 'metadata': {}}
+        ]
+        
+        result = apply_metadata_filters(results, RecipeFilter(prep_time_max=20))
+        self.assertEqual([r['id'] for r in result], ['recipe1', 'no_prep', 'legacy_prep'])
+        
+        result = apply_metadata_filters(results, RecipeFilter(max_total_time=30))
+        self.assertEqual([r['id'] for r in result], ['recipe1', 'no_prep', 'legacy_prep'])
+
 
 class TestVectorStoreIntegration(unittest.TestCase):
     """Test filtering integration with VectorRecipeStore."""
@@ -97,11 +113,11 @@ class TestVectorStoreIntegration(unittest.TestCase):
         self.store = VectorRecipeStore()
     
     @patch('src.vector.store.VectorRecipeStore.collection')
-    @patch('src.vector.store.create_search_embedding')
-    def test_search_with_filters(self, mock_embedding, mock_collection):
+    def test_search_with_filters(self, mock_collection):
         """Test search methods with filters."""
         # Mock embedding and collection response
-        mock_embedding.return_value = [0.1] * 1536
+        self.store.embedding_generator = Mock()
+        self.store.embedding_generator.generate_embedding.return_value = [0.1] * 1536
         mock_collection.query.return_value = {
             'ids': [['recipe1']],
             'distances': [[0.2]],
@@ -114,6 +130,7 @@ class TestVectorStoreIntegration(unittest.TestCase):
         
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['metadata']['difficulty'], 'Beginner')
+        self.assertEqual(mock_collection.query.call_args.kwargs['where'], {'difficulty': 'Beginner'})
 
 
 if __name__ == '__main__':
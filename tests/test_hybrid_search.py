@@ -2,11 +2,12 @@
 Tests for hybrid search functionality combining sparse and dense search.
 """
 
+import threading
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from typing import List
 
-from src.vector.store import VectorRecipeStore
+from src.vector.store import VectorRecipeStore, clear_chroma_cache
 
 
 class TestHybridSearch(unittest.TestCase):
@@ -14,6 +15,8 @@ class TestHybridSearch(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        # Each test patches its own Chroma client
+        clear_chroma_cache()
         # Mock sparse search results
         self.mock_sparse_results = [
             {
@@ -115,6 +118,29 @@ class TestHybridSearch(unittest.TestCase):
         self.assertAlmostEqual(recipe1_result['rrf_dense'], expected_rrf_dense, places=4)
         self.assertAlmostEqual(recipe1_result['combined_score'], expected_combined, places=4)
     
+    @patch('chromadb.HttpClient')
+    def test_hybrid_search_runs_legs_concurrently(self, mock_client):
+        """Test that the dense leg is already running while the sparse leg executes."""
+        store = VectorRecipeStore()
+        store.config.HYBRID_ENABLED = True
+        dense_started = threading.Event()
+        
+        def dense_search(*args, **kwargs):
+            dense_started.set()
+            return self.mock_dense_results
+        
+        def sparse_search(*args, **kwargs):
+            self.assertTrue(dense_started.wait(timeout=5))
+            return self.mock_sparse_results
+        
+        store.search_recipes = Mock(side_effect=dense_search)
+        store.search_recipes_sparse = Mock(side_effect=sparse_search)
+        
+        results = store.search_recipes_hybrid("chicken curry", n_results=5)
+        
+        self.assertTrue(any(result['rrf_sparse'] > 0 for result in results))
+        store.search_recipes.assert_called_once()
+    
     @patch('chromadb.HttpClient')
     def test_hybrid_search_with_overlapping_results(self, mock_client):
         """Test hybrid search handles overlapping results correctly."""
@@ -167,6 +167,7 @@ class TestMetaPromptingSystem(unittest.TestCase):
 class TestProcessCookingQueryFunction(unittest.TestCase):
     """Test the convenience function for processing queries."""
     
+    @patch('src.prompting.meta_prompting._system', None)
     @patch('src.prompting.meta_prompting.MetaPromptingSystem')
     def test_process_cooking_query_function(self, mock_system_class):
         """Test the convenience function works correctly."""
@@ -191,6 +192,38 @@ class TestProcessCookingQueryFunction(unittest.TestCase):
         self.assertEqual(result['strategy'], 'zero_shot')
         self.assertTrue(result['success'])
 
+    @patch('src.prompting.meta_prompting.get_vector_config')
+    @patch('src.prompting.meta_prompting._semantic_cache')
+    @patch('src.prompting.meta_prompting._system')
+    def test_process_cooking_query_semantic_cache(self, mock_system, mock_cache, mock_config):
+        """Test that cache hits skip the model and misses are stored with the lookup embedding."""
+        mock_config.return_value.SEMANTIC_CACHE_ENABLED = True
+        cached = {'response': 'Cached response', 'strategy': 'zero_shot', 'success': True}
+        mock_cache.get.return_value = (cached, [0.1, 0.2])
+
+        self.assertEqual(process_cooking_query("Test query"), cached)
+        mock_system.process_query.assert_not_called()
+
+        fresh = {'response': 'Fresh response', 'strategy': 'zero_shot', 'success': True}
+        mock_cache.get.return_value = (None, [0.1, 0.2])
+        mock_system.process_query.return_value = fresh
+
+        self.assertEqual(process_cooking_query("Other query", {}), fresh)
+        mock_cache.put.assert_called_once_with("Other query", fresh, [0.1, 0.2])
+
+    @patch('src.prompting.meta_prompting.get_vector_config')
+    @patch('src.prompting.meta_prompting._semantic_cache')
+    @patch('src.prompting.meta_prompting._system')
+    def test_process_cooking_query_followup_bypasses_cache(self, mock_system, mock_cache, mock_config):
+        """Test that follow-up questions are never served from the semantic cache."""
+        mock_config.return_value.SEMANTIC_CACHE_ENABLED = True
+        context = {'recent_conversation': [{'user_query': 'Chicken recipe?'}]}
+
+        process_cooking_query("What about with beef?", context)
+
+        mock_cache.get.assert_not_called()
+        mock_system.process_query.assert_called_once_with("What about with beef?", context)
+
 class TestWeek2Scenarios(unittest.TestCase):
     """Test the specific Week 2 scenarios work correctly."""
     
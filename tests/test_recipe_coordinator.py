@@ -5,29 +5,28 @@ Tests for simplified recipe coordinator.
 import pytest
 from unittest.mock import Mock, patch
 
+import src.core.recipe_coordinator
+import src.core.recipe_extractor
+import src.core.recipe_intent_classifier
+import src.core.user_identity
 from src.core.recipe_coordinator import RecipeCoordinator, RecipeResult, process_recipe_input
 from src.core.recipe_intent_classifier import RecipeIntent
 from src.core.recipe_extractor import RecipeExtractionResult
 from src.recipes.models import Recipe
 
 
+@pytest.fixture(autouse=True)
+def reset_singletons(monkeypatch):
+    """Start each test without cached module singletons and restore them afterwards."""
+    monkeypatch.setattr(src.core.recipe_coordinator, '_coordinator', None)
+    monkeypatch.setattr(src.core.recipe_intent_classifier, '_classifier_instance', None)
+    monkeypatch.setattr(src.core.user_identity, '_identity_manager', None)
+    monkeypatch.setattr(src.core.recipe_extractor, '_extractor', None)
+
+
 class TestRecipeCoordinator:
     """Test simplified RecipeCoordinator."""
     
-    def setup_method(self):
-        """Reset singletons."""
-        import src.core.recipe_coordinator
-        src.core.recipe_coordinator._coordinator = None
-        
-        import src.core.recipe_intent_classifier
-        src.core.recipe_intent_classifier._classifier_instance = None
-        
-        import src.core.user_identity
-        src.core.user_identity._identity_manager = None
-        
-        import src.core.recipe_extractor
-        src.core.recipe_extractor._extractor = None
-    
     @patch('src.core.recipe_coordinator.extract_recipe_from_text')
     @patch('src.core.recipe_coordinator.classify_recipe_intent')
     def test_recipe_creation_success(self, mock_classify, mock_extract):
@@ -3,12 +3,25 @@ Tests for simplified recipe extraction.
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, MagicMock, patch
 import json
 
 from src.core.recipe_extractor import RecipeExtractor, RecipeExtractionResult, extract_recipe_from_text
 
 
+def _mock_stream(content, chunk_size=7):
+    """Build a mock completion stream that yields content in small deltas."""
+    chunks = []
+    for i in range(0, len(content), chunk_size):
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = content[i:i + chunk_size]
+        chunks.append(chunk)
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(chunks)
+    return stream
+
+
 class TestRecipeExtractor:
     """Test simplified RecipeExtractor."""
     
@@ -20,8 +33,7 @@ class TestRecipeExtractor:
     @patch('src.core.recipe_extractor.OpenAI')
     def test_extract_recipe_success(self, mock_openai_class):
         """Test successful recipe extraction."""
-        mock_choice = Mock()
-        mock_choice.message.content = json.dumps({
+        content = json.dumps({
             "title": "Test Recipe",
             "ingredients": ["1 cup flour", "2 eggs"],
             "instructions": ["Mix ingredients", "Cook", "Serve"],
@@ -30,11 +42,8 @@ class TestRecipeExtractor:
             "servings": 4
         })
         
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
-        
         mock_client = Mock()
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _mock_stream(content)
         mock_openai_class.return_value = mock_client
         
         extractor = RecipeExtractor()
@@ -49,8 +58,7 @@ class TestRecipeExtractor:
     @patch('src.core.recipe_extractor.OpenAI')
     def test_extract_recipe_with_name(self, mock_openai_class):
         """Test extraction with custom name."""
-        mock_choice = Mock()
-        mock_choice.message.content = json.dumps({
+        content = json.dumps({
             "title": "Custom Recipe",
             "ingredients": ["ingredient 1", "ingredient 2"],
             "instructions": ["step 1", "step 2", "step 3"],
@@ -59,11 +67,8 @@ class TestRecipeExtractor:
             "servings": 2
         })
         
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
-        
         mock_client = Mock()
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _mock_stream(content)
         mock_openai_class.return_value = mock_client
         
         extractor = RecipeExtractor()
@@ -75,14 +80,10 @@ class TestRecipeExtractor:
     @patch('src.core.recipe_extractor.OpenAI')
     def test_extract_recipe_malformed_json(self, mock_openai_class):
         """Test handling of malformed JSON."""
-        mock_choice = Mock()
-        mock_choice.message.content = "Not valid JSON"
-        
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
+        content = "Not valid JSON"
         
         mock_client = Mock()
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _mock_stream(content)
         mock_openai_class.return_value = mock_client
         
         extractor = RecipeExtractor()
@@ -95,8 +96,7 @@ class TestRecipeExtractor:
     @patch('src.core.recipe_extractor.OpenAI')
     def test_convenience_function(self, mock_openai_class):
         """Test convenience function."""
-        mock_choice = Mock()
-        mock_choice.message.content = json.dumps({
+        content = json.dumps({
             "title": "Simple Recipe",
             "ingredients": ["ingredient 1", "ingredient 2"],
             "instructions": ["step 1", "step 2", "step 3"],
@@ -105,14 +105,36 @@ class TestRecipeExtractor:
             "servings": 2
         })
         
-        mock_response = Mock()
-        mock_response.choices = [mock_choice]
-        
         mock_client = Mock()
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _mock_stream(content)
         mock_openai_class.return_value = mock_client
         
         result = extract_recipe_from_text("Test recipe")
         
         assert result.success is True
-        assert result.recipe.title == "Simple Recipe"
\ No newline at end of file
+        assert result.recipe.title == "Simple Recipe"
+    
+    @patch('src.core.recipe_extractor.OpenAI')
+    def test_stream_stops_after_json_object(self, mock_openai_class):
+        """Test that streaming stops at the closing brace and drops trailing text."""
+        content = 'Here you go:\n```json\n' + json.dumps({
+            "title": "Brace {Test}",
+            "ingredients": ["1 cup flour", "2 eggs"],
+            "instructions": ["Mix", "Cook", "Serve"],
+            "prep_time": 5,
+            "cook_time": 15,
+            "servings": 4
+        }) + '\n```\nEnjoy your meal! {not json}'
+        stream = _mock_stream(content)
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = stream
+        mock_openai_class.return_value = mock_client
+        
+        extractor = RecipeExtractor()
+        result = extractor.extract_recipe("Make a simple recipe")
+        
+        assert result.success is True
+        assert result.recipe.title == "Brace {Test}"
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+        stream.close.assert_called_once()
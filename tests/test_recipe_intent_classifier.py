@@ -6,6 +6,7 @@ Tests LLM-based flexible intent detection with 30+ diverse scenarios.
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import os
+from src.common.utils import get_http_client
 from src.core.recipe_intent_classifier import (
     RecipeIntentClassifier, 
     RecipeIntent,
@@ -44,7 +45,7 @@ class TestRecipeIntentClassifier:
         with patch('src.core.recipe_intent_classifier.OpenAI') as mock_openai:
             with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'}):
                 classifier = RecipeIntentClassifier()
-                mock_openai.assert_called_once_with(api_key='test-key')
+                mock_openai.assert_called_once_with(api_key='test-key', http_client=get_http_client())
 
     def test_classifier_initialization_no_api_key(self):
         """Test classifier initialization fails without API key."""
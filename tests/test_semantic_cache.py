@@ -0,0 +1,69 @@
+"""
+Tests for the semantic query cache.
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from src.prompting.semantic_cache import SemanticQueryCache
+from src.common.exceptions import VectorDatabaseError
+
+
+class TestSemanticQueryCache(unittest.TestCase):
+    """Test semantic cache lookups and stores."""
+
+    def setUp(self):
+        """Set up a cache with mocked embeddings and collection."""
+        self.cache = SemanticQueryCache(threshold=0.95)
+        self.cache.embedding_generator = Mock()
+        self.cache.embedding_generator.generate_embedding.return_value = [0.1, 0.2, 0.3]
+        self.cache._collection = Mock()
+
+    def _query_result(self, distance):
+        return {
+            'ids': [['cached_id']],
+            'distances': [[distance]],
+            'metadatas': [[{'result': '{"response": "cached response", "success": true}'}]]
+        }
+
+    def test_hit_within_threshold(self):
+        """Test that a close paraphrase returns the cached response."""
+        self.cache._collection.query.return_value = self._query_result(0.02)
+        result, embedding = self.cache.get("quick chicken and rice")
+        self.assertEqual(result, {'response': 'cached response', 'success': True})
+        self.assertEqual(embedding, [0.1, 0.2, 0.3])
+
+    def test_miss_outside_threshold(self):
+        """Test that a distant query is a miss."""
+        self.cache._collection.query.return_value = self._query_result(0.2)
+        self.assertIsNone(self.cache.get("chocolate cake")[0])
+
+    def test_miss_on_empty_cache(self):
+        """Test that an empty collection is a miss."""
+        self.cache._collection.query.return_value = {'ids': [[]], 'distances': [[]], 'metadatas': [[]]}
+        self.assertIsNone(self.cache.get("chicken")[0])
+
+    def test_lookup_failure_is_a_miss(self):
+        """Test that database errors do not propagate from lookups."""
+        self.cache._collection.query.side_effect = VectorDatabaseError("down")
+        self.assertIsNone(self.cache.get("chicken")[0])
+
+    def test_put_after_miss_reuses_embedding(self):
+        """Test that storing a just-missed query does not embed it again."""
+        self.cache._collection.query.return_value = self._query_result(0.5)
+        _, embedding = self.cache.get("chicken")
+        self.cache.put("chicken", {'response': 'new response'}, embedding)
+
+        self.assertEqual(self.cache.embedding_generator.generate_embedding.call_count, 1)
+        upsert_kwargs = self.cache._collection.upsert.call_args.kwargs
+        self.assertEqual(upsert_kwargs['embeddings'], [[0.1, 0.2, 0.3]])
+        self.assertEqual(upsert_kwargs['metadatas'], [{'result': '{"response": "new response"}'}])
+
+    def test_put_without_embedding_embeds_query(self):
+        """Test that storing without a lookup embedding embeds the query."""
+        self.cache.put("chicken", {'response': 'new response'})
+        self.cache.embedding_generator.generate_embedding.assert_called_once_with("chicken")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,12 +6,15 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 from typing import List
 
+import numpy as np
+
 from src.recipes.models import Recipe
 from src.vector.keywords import (
-    extract_recipe_keywords, extract_query_keywords, 
+    extract_recipe_keywords, extract_query_keywords, extract_text_keywords,
     build_recipe_corpus, tokenize_text
 )
-from src.vector.store import VectorRecipeStore
+from src.vector.bm25 import BM25Index, encode_corpus
+from src.vector.store import VectorRecipeStore, clear_chroma_cache
 
 
 class TestKeywordExtraction(unittest.TestCase):
@@ -87,6 +90,13 @@ class TestKeywordExtraction(unittest.TestCase):
         self.assertNotIn("a", keywords)
         self.assertNotIn("for", keywords)
     
+    def test_extract_text_keywords(self):
+        """Test that free-text extraction lowercases, splits and drops short words and stopwords."""
+        text = "Stir-fry the Chicken & 2 eggs (over HIGH heat) in a wok!"
+        keywords = extract_text_keywords(text)
+        
+        self.assertEqual(keywords, ["stir", "fry", "chicken", "eggs", "high", "heat", "wok"])
+    
     def test_build_recipe_corpus(self):
         """Test building BM25 corpus from recipes."""
         recipes = [
@@ -117,11 +127,45 @@ class TestKeywordExtraction(unittest.TestCase):
         self.assertIn("curry", corpus[1])
 
 
+class TestBM25Index(unittest.TestCase):
+    """Test the integer-encoded BM25 index."""
+    
+    def setUp(self):
+        """Set up a small keyword corpus."""
+        self.corpus = [
+            ["chicken", "fried", "rice", "chicken", "eggs"],
+            ["vegetable", "curry", "coconut", "milk", "rice"],
+            ["tomato", "soup", "tomato", "cream", "rice"],
+            ["chicken", "soup", "noodles", "chicken", "chicken", "broth"]
+        ]
+    
+    def test_encode_corpus(self):
+        """Test that tokens map to stable IDs shared across documents."""
+        vocab, documents = encode_corpus(self.corpus)
+        
+        self.assertEqual(len(vocab), 13)
+        self.assertEqual(documents[0].dtype.name, 'int32')
+        self.assertEqual(documents[0].tolist(), [0, 1, 2, 0, 3])
+        self.assertEqual(documents[3][0], vocab["chicken"])
+    
+    def test_scores_match_rank_bm25(self):
+        """Test that scores match BM25Okapi, including floored IDFs and repeated query terms."""
+        from rank_bm25 import BM25Okapi
+        
+        reference = BM25Okapi(self.corpus, k1=1.2, b=0.75)
+        index = BM25Index(self.corpus, k1=1.2, b=0.75)
+        
+        for query in (["chicken"], ["rice", "soup"], ["chicken", "chicken", "broth"], ["missing"]):
+            np.testing.assert_allclose(index.get_scores(query), reference.get_scores(query))
+
+
 class TestSparseSearch(unittest.TestCase):
     """Test sparse search functionality in VectorRecipeStore."""
     
     def setUp(self):
         """Set up test fixtures."""
+        # Each test patches its own Chroma client
+        clear_chroma_cache()
         self.test_recipes = [
             Recipe(
                 title="Chicken Fried Rice",
@@ -195,6 +239,33 @@ class TestSparseSearch(unittest.TestCase):
         self.assertEqual(len(store._bm25_recipes), 2)
         self.assertEqual(len(store._bm25_recipe_ids), 2)
     
+    @patch('chromadb.HttpClient')
+    def test_bm25_index_uses_stored_keywords(self, mock_client):
+        """Test that keywords stored at ingestion are indexed without re-tokenizing."""
+        mock_client_instance = Mock()
+        mock_collection = Mock()
+        mock_client.return_value = mock_client_instance
+        mock_client_instance.heartbeat.return_value = True
+        mock_client_instance.get_collection.return_value = mock_collection
+        
+        mock_collection.get.return_value = {
+            'ids': ['recipe1', 'recipe2', 'recipe3'],
+            'metadatas': [
+                {'title': 'Chicken Fried Rice', 'keywords': 'chicken fried rice chicken fried rice eggs'},
+                {'title': 'Vegetable Curry', 'keywords': 'vegetable curry vegetable curry coconut milk'},
+                {'title': 'Tomato Soup', 'keywords': 'tomato soup tomato soup tomatoes cream'}
+            ]
+        }
+        
+        store = VectorRecipeStore()
+        with patch('src.vector.store.extract_text_keywords') as mock_extract:
+            store._build_bm25_index()
+        
+        mock_extract.assert_not_called()
+        self.assertEqual(store._bm25_recipe_ids, ['recipe1', 'recipe2', 'recipe3'])
+        scores = store._bm25_index.get_scores(['eggs'])
+        self.assertGreater(scores[0], scores[1])
+    
     @patch('chromadb.HttpClient')
     def test_sparse_search_functionality(self, mock_client):
         """Test sparse search with keyword matching."""
@@ -2,11 +2,12 @@
 Tests for user recipe collections functionality.
 """
 
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
-from src.vector.user_collections import UserRecipeCollection, UserRecipeCollectionError
+from src.vector.user_collections import UserRecipeCollection, UserRecipeCollectionError, clear_user_recipe_counts
 from src.recipes.models import Recipe
 from src.common.exceptions import RecipeValidationError
 
@@ -16,6 +17,8 @@ class TestUserRecipeCollection(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        # Counts are shared across collections, so each test starts without any
+        clear_user_recipe_counts()
         self.test_user_id = "test_user_123"
         self.invalid_user_ids = ["", None, "a" * 150, "@#$%^&*"]
         
@@ -47,7 +50,12 @@ class TestUserRecipeCollection(unittest.TestCase):
         
         self.assertEqual(collection.user_id, self.test_user_id)
         self.assertEqual(collection.collection_name, f"user_recipes_{self.test_user_id}")
-        mock_store.assert_called_once()
+        mock_store.assert_not_called()
+        
+        # The store is created on first use and then reused
+        self.assertIs(collection.store, collection.store)
+        mock_store.assert_called_once_with(api_key=None, collection_name=collection.collection_name)
+        self.assertFalse(hasattr(collection, '__dict__'))
     
     @patch('src.vector.user_collections.get_vector_config')
     def test_user_id_validation_valid(self, mock_config):
@@ -89,22 +97,57 @@ class TestUserRecipeCollection(unittest.TestCase):
         mock_config.return_value = self.mock_config
         mock_store_instance = Mock()
         mock_store.return_value = mock_store_instance
-        mock_store_instance.insert_recipe.return_value = "recipe_123"
+        mock_store_instance.add_recipes.return_value = ["recipe_123"]
         
         collection = UserRecipeCollection(self.test_user_id)
-        collection.get_user_recipe_count = Mock(return_value=0)
+        self.enterContext(patch.object(UserRecipeCollection, 'get_user_recipe_count', return_value=0))
         
         recipe_id = collection.add_user_recipe(self.test_recipe)
         
         self.assertEqual(recipe_id, "recipe_123")
-        mock_store_instance.insert_recipe.assert_called_once()
+        mock_store_instance.add_recipes.assert_called_once()
         
         # Check that metadata includes user_id and timestamp
-        call_args = mock_store_instance.insert_recipe.call_args
-        metadata = call_args[1]['metadata']
+        call_args = mock_store_instance.add_recipes.call_args
+        metadata = call_args[1]['extra_metadata']
         self.assertEqual(metadata['user_id'], self.test_user_id)
         self.assertIn('uploaded_at', metadata)
     
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_add_user_recipes_single_batch(self, mock_store, mock_config):
+        """Test that a bulk upload checks the limit once and adds in one store call."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        mock_store_instance.add_recipes.return_value = ["recipe_1", "recipe_2", "recipe_3"]
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        self.enterContext(patch.object(UserRecipeCollection, 'get_user_recipe_count', return_value=0))
+        recipes = [self.test_recipe] * 3
+        
+        recipe_ids = collection.add_user_recipes(recipes)
+        
+        self.assertEqual(recipe_ids, ["recipe_1", "recipe_2", "recipe_3"])
+        collection.get_user_recipe_count.assert_called_once()
+        mock_store_instance.add_recipes.assert_called_once()
+        self.assertEqual(mock_store_instance.add_recipes.call_args[0][0], recipes)
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_add_user_recipes_limit_exceeded(self, mock_store, mock_config):
+        """Test that a bulk upload that would pass the limit adds nothing."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        self.enterContext(patch.object(UserRecipeCollection, 'get_user_recipe_count', return_value=999))
+        
+        with self.assertRaises(UserRecipeCollectionError):
+            collection.add_user_recipes([self.test_recipe] * 2)
+        mock_store_instance.add_recipes.assert_not_called()
+    
     @patch('src.vector.user_collections.get_vector_config')
     @patch('src.vector.user_collections.VectorRecipeStore')
     def test_add_user_recipe_validation_error(self, mock_store, mock_config):
@@ -132,7 +175,7 @@ class TestUserRecipeCollection(unittest.TestCase):
         mock_config.return_value = self.mock_config
         
         collection = UserRecipeCollection(self.test_user_id)
-        collection.get_user_recipe_count = Mock(return_value=1000)  # At limit
+        self.enterContext(patch.object(UserRecipeCollection, 'get_user_recipe_count', return_value=1000))  # At limit
         
         with self.assertRaises(UserRecipeCollectionError) as context:
             collection.add_user_recipe(self.test_recipe)
@@ -167,6 +210,91 @@ class TestUserRecipeCollection(unittest.TestCase):
         self.assertEqual(recipes[0]['user_id'], self.test_user_id)
         self.assertEqual(recipes[1]['id'], 'recipe2')
     
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_get_user_recipes_columnar(self, mock_store, mock_config):
+        """Test that columnar retrieval returns Chroma's parallel lists unchanged."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        ids = ['recipe1', 'recipe2']
+        mock_store_instance.collection.get.return_value = {
+            'ids': ids,
+            'documents': None,
+            'metadatas': [{'title': 'Recipe 1'}, {'title': 'Recipe 2'}]
+        }
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        columns = collection.get_user_recipes_columnar()
+        recipes = collection.get_user_recipes()
+        
+        self.assertIs(columns['ids'], ids)
+        self.assertEqual(columns['user_id'], self.test_user_id)
+        self.assertEqual([recipe['document'] for recipe in recipes], ["", ""])
+        self.assertEqual(recipes[1]['metadata'], {'title': 'Recipe 2'})
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_get_user_recipes_without_documents(self, mock_store, mock_config):
+        """Test that metadata-only retrieval does not request documents."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        mock_store_instance.collection.get.return_value = {
+            'ids': ['recipe1'], 'documents': None, 'metadatas': [{'title': 'Recipe 1'}]
+        }
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        recipes = collection.get_user_recipes(include_documents=False)
+        
+        self.assertEqual(mock_store_instance.collection.get.call_args.kwargs['include'], ['metadatas'])
+        self.assertEqual(recipes[0]['document'], "")
+        self.assertEqual(recipes[0]['metadata'], {'title': 'Recipe 1'})
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_iter_user_recipes_pages(self, mock_store, mock_config):
+        """Test that iteration fetches pages by offset until a short page."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        pages = [['recipe1', 'recipe2'], ['recipe3', 'recipe4'], ['recipe5']]
+        mock_store_instance.collection.get.side_effect = [
+            {'ids': ids, 'documents': [f"{doc_id} content" for doc_id in ids], 'metadatas': [{} for _ in ids]}
+            for ids in pages
+        ]
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        recipes = list(collection.iter_user_recipes(page_size=2))
+        
+        self.assertEqual([recipe['id'] for recipe in recipes], ['recipe1', 'recipe2', 'recipe3', 'recipe4', 'recipe5'])
+        offsets = [call.kwargs['offset'] for call in mock_store_instance.collection.get.call_args_list]
+        self.assertEqual(offsets, [0, 2, 4])
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_iter_user_recipes_prefetches_next_page(self, mock_store, mock_config):
+        """Test that the next page is requested before the current page is consumed."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        pages = [['recipe1', 'recipe2'], ['recipe3']]
+        mock_store_instance.collection.get.side_effect = [
+            {'ids': ids, 'documents': None, 'metadatas': None} for ids in pages
+        ]
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        recipes = collection.iter_user_recipes(page_size=2, prefetch=True)
+        first = next(recipes)
+        
+        # Wait for the background fetch of the second page
+        for _ in range(100):
+            if mock_store_instance.collection.get.call_count == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(mock_store_instance.collection.get.call_count, 2)
+        self.assertEqual([first['id']] + [recipe['id'] for recipe in recipes], ['recipe1', 'recipe2', 'recipe3'])
+    
     @patch('src.vector.user_collections.get_vector_config')
     @patch('src.vector.user_collections.VectorRecipeStore')
     def test_get_user_recipe_count(self, mock_store, mock_config):
@@ -175,13 +303,51 @@ class TestUserRecipeCollection(unittest.TestCase):
         mock_store_instance = Mock()
         mock_store.return_value = mock_store_instance
         
-        mock_store_instance.count_recipes.return_value = 5
+        mock_store_instance.collection.count.return_value = 5
         
         collection = UserRecipeCollection(self.test_user_id)
         count = collection.get_user_recipe_count()
         
         self.assertEqual(count, 5)
     
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_user_recipe_count_cached_across_adds(self, mock_store, mock_config):
+        """Test that the count is read once, kept current by adds and re-read after deletes."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        mock_store_instance.collection.count.return_value = 5
+        mock_store_instance.add_recipes.side_effect = lambda recipes, **kwargs: [f"recipe_{i}" for i in range(len(recipes))]
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        collection.add_user_recipe(self.test_recipe)
+        collection.add_user_recipes([self.test_recipe] * 2)
+        
+        self.assertEqual(collection.get_user_recipe_count(), 8)
+        mock_store_instance.collection.count.assert_called_once()
+        
+        collection.delete_user_recipe("recipe_0")
+        mock_store_instance.collection.count.return_value = 7
+        self.assertEqual(collection.get_user_recipe_count(), 7)
+        self.assertEqual(mock_store_instance.collection.count.call_count, 2)
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_user_recipe_count_shared_between_collections(self, mock_store, mock_config):
+        """Test that a new collection object for the same user reuses the known count."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        mock_store_instance.collection.count.return_value = 5
+        mock_store_instance.add_recipes.return_value = ["recipe_1"]
+        
+        UserRecipeCollection(self.test_user_id).add_user_recipe(self.test_recipe)
+        
+        self.assertEqual(UserRecipeCollection(self.test_user_id).get_user_recipe_count(), 6)
+        self.assertEqual(UserRecipeCollection("other_user").get_user_recipe_count(), 5)
+        self.assertEqual(mock_store_instance.collection.count.call_count, 2)
+    
     @patch('src.vector.user_collections.get_vector_config')
     @patch('src.vector.user_collections.VectorRecipeStore')
     def test_search_user_recipes_hybrid(self, mock_store, mock_config):
@@ -246,13 +412,41 @@ class TestUserRecipeCollection(unittest.TestCase):
         mock_store_instance = Mock()
         mock_store.return_value = mock_store_instance
         
-        mock_store_instance.delete_recipe.return_value = True
+        mock_store_instance.delete_recipes.return_value = True
         
         collection = UserRecipeCollection(self.test_user_id)
         result = collection.delete_user_recipe("recipe_123")
         
         self.assertTrue(result)
-        mock_store_instance.delete_recipe.assert_called_once_with("recipe_123")
+        mock_store_instance.delete_recipes.assert_called_once_with(["recipe_123"])
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_delete_user_recipes_single_request(self, mock_store, mock_config):
+        """Test that several recipes are deleted in one store call."""
+        mock_config.return_value = self.mock_config
+        mock_store_instance = Mock()
+        mock_store.return_value = mock_store_instance
+        mock_store_instance.delete_recipes.return_value = False
+        
+        collection = UserRecipeCollection(self.test_user_id)
+        with self.assertRaises(UserRecipeCollectionError):
+            collection.delete_user_recipes(["recipe_1", "recipe_2"])
+        
+        mock_store_instance.delete_recipes.assert_called_once_with(["recipe_1", "recipe_2"])
+    
+    @patch('src.vector.user_collections.get_vector_config')
+    @patch('src.vector.user_collections.VectorRecipeStore')
+    def test_delete_user_recipes_empty(self, mock_store, mock_config):
+        """Test that deleting no recipes skips the store and keeps the cached count."""
+        mock_config.return_value = self.mock_config
+        collection = UserRecipeCollection(self.test_user_id)
+        
+        with patch.object(UserRecipeCollection, 'invalidate_count') as mock_invalidate:
+            self.assertTrue(collection.delete_user_recipes([]))
+        
+        mock_store.assert_not_called()
+        mock_invalidate.assert_not_called()
     
 
 
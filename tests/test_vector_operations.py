@@ -5,14 +5,19 @@ Tests embedding generation, vector store operations, and recipe ingestion.
 
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+import json
 import uuid
+import os
+import tempfile
 from typing import List
 
 from src.recipes.models import Recipe
 from src.vector.embeddings import RecipeEmbeddingGenerator, create_search_embedding
-from src.vector.store import VectorRecipeStore, VectorStoreError
+from src.vector.embedding_cache import EmbeddingCache
+from src.vector.keywords import extract_recipe_keywords
+from src.vector.store import VectorRecipeStore, VectorStoreError, clear_chroma_cache, _chroma_collections
 from src.vector.ingestion import RecipeIngestionPipeline
-from src.common.exceptions import EmbeddingGenerationError
+from src.common.exceptions import EmbeddingGenerationError, PartialWriteError, VectorDatabaseError
 
 class TestRecipeEmbeddingGenerator(unittest.TestCase):
     """Test recipe embedding generation functionality."""
@@ -48,6 +53,20 @@ class TestRecipeEmbeddingGenerator(unittest.TestCase):
         self.assertIn("Ingredients:", text)
         self.assertIn("Instructions:", text)
     
+    def test_recipe_text_exact_format(self):
+        """Test the exact embedding text layout, which cached embeddings are keyed on."""
+        generator = RecipeEmbeddingGenerator()
+        text = generator.prepare_recipe_text(self.sample_recipe)
+        
+        self.assertEqual(text, (
+            "Recipe: Test Chicken Rice\n"
+            "Difficulty: Beginner\n"
+            "Cooking time: 15 minutes prep, 25 minutes cook\n"
+            "Serves 4 people\n"
+            "Ingredients: 2 cups rice | 1 lb chicken breast | Salt to taste\n"
+            "Instructions: Cook rice in pot Season chicken thoroughly Combine and serve hot"
+        ))
+    
     @patch('src.vector.embeddings.OpenAI')
     def test_embedding_generation(self, mock_openai_class):
         """Test OpenAI embedding generation."""
@@ -100,6 +119,7 @@ class TestRecipeEmbeddingGenerator(unittest.TestCase):
         self.assertEqual(metadata['servings'], 4)
         self.assertEqual(metadata['ingredient_count'], 3)
         self.assertEqual(metadata['instruction_count'], 3)
+        self.assertEqual(metadata['keywords'].split(), extract_recipe_keywords(self.sample_recipe))
     
     @patch('src.vector.embeddings.OpenAI')
     def test_batch_embedding_generation(self, mock_openai_class):
@@ -135,12 +155,69 @@ class TestRecipeEmbeddingGenerator(unittest.TestCase):
             self.assertIn('embedding', result)
             self.assertIn('metadata', result)
     
+    @patch('src.vector.embeddings.OpenAI')
+    def test_batch_embedding_single_request(self, mock_openai_class):
+        """Test that a batch of recipes is embedded with one API request."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        
+        mock_response = Mock()
+        mock_response.data = [Mock(embedding=[0.1] * 1536), Mock(embedding=[0.2] * 1536)]
+        mock_client.embeddings.create.return_value = mock_response
+        
+        other_recipe = self.sample_recipe.model_copy(update={"title": "Test Pasta"})
+        generator = RecipeEmbeddingGenerator()
+        results = generator.generate_batch_embeddings([self.sample_recipe, other_recipe])
+        
+        mock_client.embeddings.create.assert_called_once()
+        self.assertEqual(len(mock_client.embeddings.create.call_args.kwargs['input']), 2)
+        self.assertEqual(results[0]['embedding'][0], 0.1)
+        self.assertEqual(results[1]['embedding'][0], 0.2)
+        self.assertEqual(results[1]['metadata']['title'], "Test Pasta")
+    
+    @patch('src.vector.embeddings.OpenAI')
+    def test_batch_embedding_uses_cache(self, mock_openai_class):
+        """Test that cached recipe texts are not sent to the API again."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.embeddings.create.return_value = Mock(data=[Mock(embedding=[0.5, 0.25])])
+        
+        other_recipe = self.sample_recipe.model_copy(update={"title": "Test Pasta"})
+        with tempfile.TemporaryDirectory() as cache_dir:
+            generator = RecipeEmbeddingGenerator(cache_path=os.path.join(cache_dir, "embeddings.db"))
+            generator.generate_batch_embeddings([self.sample_recipe])
+            results = generator.generate_batch_embeddings([self.sample_recipe, other_recipe])
+        
+        # Second call only embeds the recipe that was not cached yet
+        self.assertEqual(mock_client.embeddings.create.call_count, 2)
+        self.assertEqual(len(mock_client.embeddings.create.call_args.kwargs['input']), 1)
+        self.assertEqual(results[0]['embedding'], [0.5, 0.25])
+        self.assertEqual(len(results), 2)
+    
+    @patch('src.vector.embeddings.OpenAI')
+    def test_query_embeddings_bypass_disk_cache(self, mock_openai_class):
+        """Test that one-off text embeddings are not written to the recipe cache."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.embeddings.create.return_value = Mock(data=[Mock(embedding=[0.5, 0.25])])
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            generator = RecipeEmbeddingGenerator(cache_path=os.path.join(cache_dir, "embeddings.db"))
+            generator.generate_embedding("chicken")
+            generator.generate_embedding("chicken")
+            key = EmbeddingCache.make_key(generator.vector_config.EMBEDDING_MODEL, "chicken")
+            self.assertEqual(generator.cache.get_many([key]), {})
+        
+        self.assertEqual(mock_client.embeddings.create.call_count, 2)
+    
 
 class TestVectorRecipeStore(unittest.TestCase):
     """Test vector store operations with mocked Chroma DB."""
     
     def setUp(self):
         """Set up test fixtures."""
+        # Each test patches its own Chroma client
+        clear_chroma_cache()
         self.sample_recipe = Recipe(
             title="Test Recipe",
             prep_time=10,
@@ -150,6 +227,12 @@ class TestVectorRecipeStore(unittest.TestCase):
             ingredients=["ingredient1", "ingredient2"],
             instructions=["first step", "second step", "third step"]
         )
+    
+    def _attach_collection(self, store):
+        """Put a mock collection in the shared cache the store resolves from."""
+        collection = Mock()
+        _chroma_collections[(store.config.HOST, store.config.PORT, store.collection_name)] = collection
+        return collection
         
     @patch('chromadb.HttpClient')
     @patch('src.vector.embeddings.RecipeEmbeddingGenerator')
@@ -168,7 +251,36 @@ class TestVectorRecipeStore(unittest.TestCase):
         mock_client_instance.heartbeat.assert_called_once()
     
     @patch('chromadb.HttpClient')
-    @patch('src.vector.embeddings.RecipeEmbeddingGenerator')
+    def test_stores_share_client_and_collection(self, mock_client):
+        """Test that stores for the same server and collection reuse one client and collection."""
+        mock_client_instance = Mock()
+        mock_client.return_value = mock_client_instance
+        
+        first, second = VectorRecipeStore(), VectorRecipeStore()
+        
+        self.assertIs(first.collection, second.collection)
+        mock_client.assert_called_once()
+        mock_client_instance.heartbeat.assert_called_once()
+        mock_client_instance.get_collection.assert_called_once()
+    
+    @patch('chromadb.HttpClient')
+    def test_clear_collection_refreshes_other_stores(self, mock_client):
+        """Test that clearing through one store replaces the collection for every store and forgets its count."""
+        mock_client_instance = Mock()
+        mock_client.return_value = mock_client_instance
+        old_collection, new_collection = Mock(), Mock()
+        mock_client_instance.get_collection.side_effect = [old_collection, new_collection]
+        
+        first, second = VectorRecipeStore(), VectorRecipeStore()
+        self.assertIs(second.collection, old_collection)
+        with patch('src.vector.user_collections.forget_user_recipe_count') as mock_forget:
+            self.assertTrue(first.clear_collection())
+        
+        self.assertIs(second.collection, new_collection)
+        mock_forget.assert_called_once_with(first.config.HOST, first.config.PORT, first.collection_name)
+    
+    @patch('chromadb.HttpClient')
+    @patch('src.vector.store.RecipeEmbeddingGenerator')
     def test_add_single_recipe(self, mock_generator, mock_client):
         """Test adding a single recipe to vector store."""
         # Mock Chroma client
@@ -181,18 +293,100 @@ class TestVectorRecipeStore(unittest.TestCase):
         # Mock embedding generator
         mock_gen_instance = Mock()
         mock_generator.return_value = mock_gen_instance
-        mock_gen_instance.generate_recipe_embedding.return_value = {
+        mock_gen_instance.generate_batch_embeddings.side_effect = lambda recipes: [{
             'embedding': [0.1] * 1536,
             'text': 'test text',
-            'metadata': {'title': 'Test Recipe'}
-        }
+            'metadata': {'title': 'Test Recipe'},
+            'recipe': recipes[0]
+        }]
         
         store = VectorRecipeStore()
         recipe_id = store.add_recipe(self.sample_recipe, "test_id")
         
         self.assertEqual(recipe_id, "test_id")
+        mock_gen_instance.generate_batch_embeddings.assert_called_once_with([self.sample_recipe])
         mock_collection.add.assert_called_once()
     
+    def test_add_recipe_wraps_embedding_failure(self):
+        """Test that a single add reports embedding failures as a database error."""
+        store = VectorRecipeStore()
+        self._attach_collection(store)
+        store.embedding_generator = Mock()
+        store.embedding_generator.generate_batch_embeddings.return_value = []
+        
+        with self.assertRaises(VectorDatabaseError) as context:
+            store.add_recipe(self.sample_recipe, "test_id")
+        
+        self.assertIsInstance(context.exception.__cause__, EmbeddingGenerationError)
+        store.collection.add.assert_not_called()
+    
+    def test_add_recipes_pairs_ids_after_failed_embedding(self):
+        """Test that IDs stay with their recipes when one in the middle fails to embed."""
+        recipes = [self.sample_recipe.model_copy(update={"title": title}) for title in ("One", "Two", "Three")]
+        store = VectorRecipeStore()
+        self._attach_collection(store)
+        store.embedding_generator = Mock()
+        store.embedding_generator.generate_batch_embeddings.return_value = [
+            {'embedding': [0.1], 'text': recipe.title, 'metadata': {}, 'recipe': recipe}
+            for recipe in (recipes[0], recipes[2])
+        ]
+        
+        added_ids = store.add_recipes(recipes, ["id_one", "id_two", "id_three"])
+        
+        self.assertEqual(added_ids, ["id_one", "id_three"])
+        self.assertEqual(store.collection.add.call_args.kwargs['ids'], ["id_one", "id_three"])
+    
+    def test_add_recipes_writes_each_chunk(self):
+        """Test that large inputs are embedded and written chunk by chunk in order."""
+        recipes = [self.sample_recipe.model_copy(update={"title": f"Recipe {i}"}) for i in range(5)]
+        recipe_ids = [f"id_{i}" for i in range(5)]
+        store = VectorRecipeStore()
+        self._attach_collection(store)
+        store.embedding_generator = Mock()
+        store.embedding_generator.generate_batch_embeddings.side_effect = lambda chunk: [
+            {'embedding': [0.1], 'text': recipe.title, 'metadata': {}, 'recipe': recipe}
+            for recipe in chunk
+        ]
+        
+        with patch.object(store.config, 'EMBEDDING_BATCH_SIZE', 2), patch.object(store.config, 'MAX_CONCURRENT_BATCHES', 1):
+            added_ids = store.add_recipes(recipes, recipe_ids)
+        
+        self.assertEqual(added_ids, recipe_ids)
+        written_ids = [call.kwargs['ids'] for call in store.collection.add.call_args_list]
+        self.assertEqual(written_ids, [["id_0", "id_1"], ["id_2", "id_3"], ["id_4"]])
+    
+    def test_add_recipes_reports_written_chunks_on_failure(self):
+        """Test that a failed chunk write reports the IDs already added by earlier chunks."""
+        recipes = [self.sample_recipe.model_copy(update={"title": f"Recipe {i}"}) for i in range(4)]
+        store = VectorRecipeStore()
+        self._attach_collection(store)
+        store.collection.add.side_effect = [None, VectorDatabaseError("write failed")]
+        store.embedding_generator = Mock()
+        store.embedding_generator.generate_batch_embeddings.side_effect = lambda chunk: [
+            {'embedding': [0.1], 'text': recipe.title, 'metadata': {}, 'recipe': recipe}
+            for recipe in chunk
+        ]
+        
+        with patch.object(store.config, 'EMBEDDING_BATCH_SIZE', 2), patch.object(store.config, 'MAX_CONCURRENT_BATCHES', 1):
+            with self.assertRaises(PartialWriteError) as context:
+                store.add_recipes(recipes, [f"id_{i}" for i in range(4)])
+        
+        self.assertEqual(context.exception.added_ids, ["id_0", "id_1"])
+    
+    def test_add_recipes_merges_extra_metadata(self):
+        """Test that extra metadata is added to each recipe's generated metadata."""
+        store = VectorRecipeStore()
+        self._attach_collection(store)
+        store.embedding_generator = Mock()
+        store.embedding_generator.generate_batch_embeddings.return_value = [
+            {'embedding': [0.1], 'text': 'text', 'metadata': {'title': 'Test Recipe'}, 'recipe': self.sample_recipe}
+        ]
+        
+        store.add_recipes([self.sample_recipe], ["id_one"], extra_metadata={'user_id': 'user_1'})
+        
+        self.assertEqual(store.collection.add.call_args.kwargs['metadatas'],
+                         [{'title': 'Test Recipe', 'user_id': 'user_1'}])
+    
     @patch('chromadb.HttpClient')
     @patch('src.vector.embeddings.RecipeEmbeddingGenerator')
     def test_search_recipes(self, mock_generator, mock_client):
@@ -216,8 +410,8 @@ class TestVectorRecipeStore(unittest.TestCase):
         mock_gen_instance = Mock()
         mock_generator.return_value = mock_gen_instance
         
-        with patch('src.vector.store.create_search_embedding', return_value=[0.1] * 1536):
-            store = VectorRecipeStore()
+        store = VectorRecipeStore()
+        with patch.object(store.embedding_generator, 'generate_embedding', return_value=[0.1] * 1536):
             results = store.search_recipes("test query")
         
         self.assertEqual(len(results), 2)
@@ -225,6 +419,21 @@ class TestVectorRecipeStore(unittest.TestCase):
         self.assertEqual(results[0]['similarity'], 0.9)  # 1 - 0.1
         self.assertEqual(results[1]['similarity'], 0.7)  # 1 - 0.3
     
+    def test_search_recipes_reuses_query_embedding(self):
+        """Test that repeated queries are embedded once and the cache evicts the oldest query."""
+        store = VectorRecipeStore()
+        self._attach_collection(store)
+        store.collection.query.return_value = {'ids': [[]], 'distances': [[]], 'metadatas': [[]], 'documents': [[]]}
+        store.embedding_generator = Mock()
+        store.embedding_generator.generate_embedding.return_value = [0.1] * 1536
+        
+        with patch.object(store.config, 'QUERY_EMBEDDING_CACHE_SIZE', 2):
+            for query in ("pasta", "pasta", "soup", "curry", "pasta"):
+                store.search_recipes(query)
+        
+        embedded = [call.args[0] for call in store.embedding_generator.generate_embedding.call_args_list]
+        self.assertEqual(embedded, ["pasta", "soup", "curry", "pasta"])
+    
     @patch('chromadb.HttpClient')
     @patch('src.vector.embeddings.RecipeEmbeddingGenerator')
     def test_get_recipe_by_id(self, mock_generator, mock_client):
@@ -266,7 +475,7 @@ class TestVectorRecipeStore(unittest.TestCase):
         self.assertEqual(count, 42)
     
     @patch('chromadb.HttpClient')
-    @patch('src.vector.embeddings.RecipeEmbeddingGenerator')
+    @patch('src.vector.store.RecipeEmbeddingGenerator')
     def test_update_recipe(self, mock_generator, mock_client):
         """Test recipe update functionality."""
         # Mock Chroma client and collection
@@ -279,11 +488,17 @@ class TestVectorRecipeStore(unittest.TestCase):
         # Mock embedding generation
         mock_gen_instance = Mock()
         mock_generator.return_value = mock_gen_instance
-        mock_gen_instance.generate_recipe_embedding.return_value = {
+        mock_gen_instance.generate_batch_embeddings.side_effect = lambda recipes: [{
             'embedding': [0.1, 0.2, 0.3],
             'text': 'Updated recipe text',
-            'metadata': {'title': 'Updated Recipe', 'difficulty': 'Intermediate'}
-        }
+            'metadata': {
+                'title': recipes[0].title,
+                'difficulty': recipes[0].difficulty,
+                'prep_time': recipes[0].prep_time,
+                'cook_time': recipes[0].cook_time
+            },
+            'recipe': recipes[0]
+        }]
         
         # Create updated recipe
         updated_recipe = Recipe(
@@ -329,9 +544,9 @@ class TestRecipeIngestionPipeline(unittest.TestCase):
         """Test that pipeline initializes correctly."""
         pipeline = RecipeIngestionPipeline()
         self.assertIsNotNone(pipeline.vector_store)
-        self.assertEqual(pipeline.stats['processed'], 0)
-        self.assertEqual(pipeline.stats['successful'], 0)
-        self.assertEqual(pipeline.stats['failed'], 0)
+        self.assertEqual(pipeline.stats.processed, 0)
+        self.assertEqual(pipeline.stats.successful, 0)
+        self.assertEqual(pipeline.stats.failed, 0)
     
     def test_recipe_id_generation(self):
         """Test recipe ID generation using content-based hash."""
@@ -361,9 +576,221 @@ class TestRecipeIngestionPipeline(unittest.TestCase):
         different_id = pipeline._generate_recipe_id(different_recipe)
         self.assertNotEqual(recipe_id, different_id)
 
+    def test_recipe_id_distinguishes_similar_titles(self):
+        """Test that titles differing only in punctuation get distinct IDs."""
+        pipeline = RecipeIngestionPipeline()
+        recipes = [
+            Recipe(
+                title=title,
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+            for title in ("Chicken-Fried Rice", "Chicken Fried Rice", "chicken fried rice")
+        ]
+        
+        recipe_ids = {pipeline._generate_recipe_id(recipe) for recipe in recipes}
+        self.assertEqual(len(recipe_ids), 3)
+
+    def test_individual_fallback_when_batch_fails(self):
+        """Test that a failed batch falls back to per-recipe ingestion in order."""
+        pipeline = RecipeIngestionPipeline()
+        recipes = [
+            Recipe(
+                title=f"Recipe {i}",
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+            for i in range(3)
+        ]
+        recipe_ids = ["id_0", "id_1", "id_2"]
+        
+        def generate_recipe_embedding(recipe):
+            if recipe.title == "Recipe 1":
+                raise EmbeddingGenerationError("embedding failed")
+            return {'embedding': [0.1], 'text': recipe.title, 'metadata': {'title': recipe.title}, 'recipe': recipe}
+        
+        pipeline.vector_store = Mock()
+        pipeline.vector_store.add_recipes.side_effect = EmbeddingGenerationError("batch failed")
+        pipeline.vector_store.embedding_generator.generate_recipe_embedding.side_effect = generate_recipe_embedding
+        pipeline.vector_store.add_embeddings.side_effect = lambda recipe_ids, **kwargs: recipe_ids
+        
+        successful_ids = pipeline._ingest_recipes(recipes, recipe_ids)
+        
+        self.assertEqual(successful_ids, ["id_0", "id_2"])
+        self.assertEqual(pipeline.stats.successful, 2)
+        self.assertEqual(pipeline.stats.failed, 1)
+        self.assertEqual(pipeline.vector_store.embedding_generator.generate_recipe_embedding.call_count, 3)
+        pipeline.vector_store.add_embeddings.assert_called_once()
+        self.assertEqual(pipeline.vector_store.add_embeddings.call_args.kwargs['documents'], ["Recipe 0", "Recipe 2"])
+    
+    def test_partial_write_retries_only_missing_recipes(self):
+        """Test that recipes already written before a failed chunk are not ingested again."""
+        pipeline = RecipeIngestionPipeline()
+        recipes = [
+            Recipe(
+                title=f"Recipe {i}",
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+            for i in range(3)
+        ]
+        pipeline.vector_store = Mock()
+        pipeline.vector_store.add_recipes.side_effect = PartialWriteError("chunk failed", ["id_0"])
+        pipeline.vector_store.embedding_generator.generate_recipe_embedding.side_effect = lambda recipe: {
+            'embedding': [0.1], 'text': recipe.title, 'metadata': {}, 'recipe': recipe
+        }
+        pipeline.vector_store.add_embeddings.side_effect = lambda recipe_ids, **kwargs: recipe_ids
+        
+        successful_ids = pipeline._ingest_recipes(recipes, ["id_0", "id_1", "id_2"])
+        
+        self.assertEqual(successful_ids, ["id_0", "id_1", "id_2"])
+        self.assertEqual(pipeline.vector_store.embedding_generator.generate_recipe_embedding.call_count, 2)
+        self.assertEqual(pipeline.vector_store.add_embeddings.call_args.kwargs['recipe_ids'], ["id_1", "id_2"])
+        self.assertEqual(pipeline.stats.successful, 3)
+        self.assertEqual(pipeline.stats.failed, 0)
+    
+    def test_database_error_does_not_fall_back(self):
+        """Test that vector database failures are not retried one recipe at a time."""
+        pipeline = RecipeIngestionPipeline()
+        recipe = Recipe(
+            title="Recipe 0",
+            prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+            ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+        )
+        pipeline.vector_store = Mock()
+        pipeline.vector_store.add_recipes.side_effect = VectorDatabaseError("write failed")
+        
+        with self.assertRaises(VectorDatabaseError):
+            pipeline._ingest_recipes([recipe], ["id_0"])
+        
+        pipeline.vector_store.embedding_generator.generate_recipe_embedding.assert_not_called()
+
+    def test_ingest_in_chunks_accumulates_stats(self):
+        """Test that chunked ingestion generates IDs per chunk and sums stats."""
+        pipeline = RecipeIngestionPipeline()
+        recipes = [
+            Recipe(
+                title=f"Recipe {i}",
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+            for i in range(5)
+        ]
+        pipeline.vector_store = Mock()
+        pipeline.vector_store.add_recipes.side_effect = lambda chunk, ids: ids
+        
+        with patch('src.vector.ingestion.get_vector_config') as mock_config:
+            mock_config.return_value.INGESTION_CHUNK_SIZE = 2
+            successful_ids = pipeline._ingest_in_chunks(iter(recipes))
+        
+        self.assertEqual(successful_ids, [pipeline._generate_recipe_id(r) for r in recipes])
+        self.assertEqual(pipeline.vector_store.add_recipes.call_count, 3)
+        self.assertEqual(pipeline.stats.processed, 5)
+        self.assertEqual(pipeline.stats.successful, 5)
+
+    def test_ingest_via_batch_api(self):
+        """Test Batch API ingestion adds only recipes whose embeddings succeeded."""
+        pipeline = RecipeIngestionPipeline()
+        recipes = [
+            Recipe(
+                title=f"Recipe {i}",
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+            for i in range(2)
+        ]
+        
+        mock_client = Mock()
+        mock_client.files.create.return_value = Mock(id="file_in")
+        mock_client.batches.create.return_value = Mock(id="batch_1", status="completed", output_file_id="file_out")
+        mock_client.files.content.return_value = Mock(text="\n".join([
+            '{"custom_id": "id_0", "response": {"status_code": 200, "body": {"data": [{"embedding": [0.1, 0.2]}]}}}',
+            '{"custom_id": "id_1", "response": {"status_code": 500, "body": {}}}'
+        ]))
+        
+        pipeline.vector_store = Mock()
+        pipeline.vector_store.embedding_generator = RecipeEmbeddingGenerator()
+        pipeline.vector_store.embedding_generator.client = mock_client
+        pipeline.vector_store.add_embeddings.side_effect = lambda recipe_ids, **kwargs: recipe_ids
+        
+        successful_ids = pipeline.ingest_via_batch_api(recipes, ["id_0", "id_1"])
+        
+        self.assertEqual(successful_ids, ["id_0"])
+        self.assertEqual(pipeline.stats.successful, 1)
+        self.assertEqual(pipeline.stats.failed, 1)
+        call_kwargs = pipeline.vector_store.add_embeddings.call_args.kwargs
+        self.assertEqual(call_kwargs['embeddings'], [[0.1, 0.2]])
+        self.assertEqual(call_kwargs['metadatas'][0]['title'], "Recipe 0")
+        self.assertEqual(mock_client.batches.create.call_args.kwargs['endpoint'], "/v1/embeddings")
+
+    def _batch_pipeline(self, output_lines, status="completed"):
+        pipeline = RecipeIngestionPipeline()
+        mock_client = Mock()
+        mock_client.files.create.return_value = Mock(id="file_in")
+        mock_client.batches.create.return_value = Mock(id="batch_1", status=status, output_file_id="file_out")
+        mock_client.files.content.return_value = Mock(text="\n".join(output_lines))
+        
+        pipeline.vector_store = Mock()
+        pipeline.vector_store.embedding_generator = RecipeEmbeddingGenerator()
+        pipeline.vector_store.embedding_generator.client = mock_client
+        pipeline.vector_store.add_embeddings.side_effect = lambda recipe_ids, **kwargs: recipe_ids
+        return pipeline, mock_client
+    
+    def test_batch_api_skips_cached_embeddings(self):
+        """Test that recipes with cached embeddings are not resubmitted to the Batch API."""
+        recipes = [
+            Recipe(
+                title=f"Recipe {i}",
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+            for i in range(2)
+        ]
+        pipeline, mock_client = self._batch_pipeline([
+            '{"custom_id": "id_1", "response": {"status_code": 200, "body": {"data": [{"embedding": [0.3, 0.4]}]}}}'
+        ])
+        generator = pipeline.vector_store.embedding_generator
+        cached_key = EmbeddingCache.make_key(generator.vector_config.EMBEDDING_MODEL, generator.prepare_recipe_text(recipes[0]))
+        generator.cache = Mock()
+        generator.cache.get_many.side_effect = lambda keys: {key: [0.1, 0.2] for key in keys if key == cached_key}
+        
+        successful_ids = pipeline.ingest_via_batch_api(recipes, ["id_0", "id_1"])
+        
+        self.assertEqual(successful_ids, ["id_0", "id_1"])
+        uploaded = mock_client.files.create.call_args.kwargs['file'][1].decode()
+        self.assertEqual([json.loads(line)["custom_id"] for line in uploaded.splitlines()], ["id_1"])
+        self.assertEqual(list(generator.cache.put_many.call_args.args[0].values()), [[0.3, 0.4]])
+        self.assertEqual(pipeline.vector_store.add_embeddings.call_args.kwargs['embeddings'], [[0.1, 0.2], [0.3, 0.4]])
+    
+    def test_batch_api_clears_only_after_embeddings_fetched(self):
+        """Test that existing recipes survive a failed batch and are cleared before the write otherwise."""
+        recipes = [
+            Recipe(
+                title="Recipe 0",
+                prep_time=10, cook_time=20, servings=4, difficulty="Beginner",
+                ingredients=["ing1", "ing2"], instructions=["step1", "step2", "step3"]
+            )
+        ]
+        pipeline, _ = self._batch_pipeline([], status="failed")
+        with self.assertRaises(VectorStoreError):
+            pipeline.ingest_via_batch_api(recipes, ["id_0"], clear_existing=True)
+        pipeline.vector_store.clear_collection.assert_not_called()
+        
+        pipeline, _ = self._batch_pipeline([
+            '{"custom_id": "id_0", "response": {"status_code": 200, "body": {"data": [{"embedding": [0.1, 0.2]}]}}}'
+        ])
+        pipeline.ingest_via_batch_api(recipes, ["id_0"], clear_existing=True)
+        store_calls = [call[0] for call in pipeline.vector_store.method_calls]
+        self.assertLess(store_calls.index('clear_collection'), store_calls.index('add_embeddings'))
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for vector operations."""
     
+    def setUp(self):
+        """Set up test fixtures."""
+        # Each test patches its own Chroma client
+        clear_chroma_cache()
+    
     @patch('src.vector.embeddings.OpenAI')
     @patch('chromadb.HttpClient')
     def test_end_to_end_workflow(self, mock_client, mock_openai_class):
@@ -402,7 +829,7 @@ class TestIntegration(unittest.TestCase):
         store = VectorRecipeStore()
         recipe_id = store.add_recipe(recipe)
         
-        with patch('src.vector.store.create_search_embedding', return_value=[0.1] * 1536):
+        with patch.object(store.embedding_generator, 'generate_embedding', return_value=[0.1] * 1536):
             results = store.search_recipes("test query")
         
         self.assertIsNotNone(recipe_id)